@@ -0,0 +1 @@
+"""fxmoney benchmarks; run with `python -m benchmarks.run`."""
@@ -0,0 +1,71 @@
+"""
+Synthetic ECB history for the benchmarks (no network needed).
+- make_csv(): deterministic eurofxref-hist.csv text, newest day first,
+  business days only, with 'N/A' gaps like the real file
+- use_cache(): write CSV + ZIP into a directory and point ECBBackend at it
+- point_at(): only redirect the ECB cache (e.g. in a child process)
+"""
+
+from __future__ import annotations
+import io
+import os
+import random
+import zipfile
+from datetime import date, timedelta
+
+import fxmoney.rates.ecb as ecb_module
+
+CURRENCIES = (
+    "USD JPY BGN CZK DKK GBP HUF PLN RON SEK CHF ISK NOK TRY AUD BRL CAD CNY "
+    "HKD IDR ILS INR KRW MXN MYR NZD PHP SGD THB ZAR"
+).split()
+# currencies quoted only for part of the history (exercise the fallback walk)
+PARTIAL = {"ISK": (date(2008, 10, 10), date(2018, 2, 5)), "BGN": (date(1999, 1, 4), date(2000, 7, 19))}
+START = date(1999, 1, 4)
+END = date(2024, 12, 31)
+
+
+def make_csv(start: date = START, end: date = END, seed: int = 1999) -> str:
+    """ECB-style CSV with one row per business day between start and end."""
+    rnd = random.Random(seed)
+    level = {cur: rnd.uniform(0.5, 1500.0) for cur in CURRENCIES}
+    rows = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            cells = []
+            for cur in CURRENCIES:
+                level[cur] *= 1 + rnd.gauss(0, 0.004)
+                gap = PARTIAL.get(cur)
+                quoted = gap is None or not (gap[0] <= day <= gap[1])
+                cells.append(f"{level[cur]:.4f}" if quoted else "N/A")
+            rows.append(f"{day.isoformat()},{','.join(cells)},")
+        day += timedelta(days=1)
+    rows.reverse()
+    return "\n".join([f"Date,{','.join(CURRENCIES)},", *rows]) + "\n"
+
+
+def point_at(directory: str) -> None:
+    """Redirect every ECBBackend cache path into `directory`."""
+    ecb_module.CACHE_DIR = directory
+    ecb_module.CACHE_ZIP = os.path.join(directory, "eurofxref-hist.zip")
+    ecb_module.CACHE_CSV = os.path.join(directory, "eurofxref-hist.csv")
+    ecb_module.CACHE_SNAPSHOT = os.path.join(directory, "eurofxref-hist.fxrt")
+    ecb_module.CACHE_INCR = os.path.join(directory, "eurofxref-incr.csv")
+    ecb_module.CACHE_LOCK = os.path.join(directory, "eurofxref.lock")
+    # a fresh ZIP means no refresh is attempted; the feeds are never reached
+    ecb_module.ZIP_URL = ecb_module.FEED_URL = "file:///nonexistent"
+
+
+def use_cache(directory: str, csv_text: str | None = None) -> None:
+    """Write the fixture ZIP + CSV into `directory` and redirect the ECB cache there."""
+    os.makedirs(directory, exist_ok=True)
+    point_at(directory)
+    csv_text = csv_text or make_csv()
+    with open(ecb_module.CACHE_CSV, "w", encoding="utf-8") as f:
+        f.write(csv_text)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("eurofxref-hist.csv", csv_text)
+    with open(ecb_module.CACHE_ZIP, "wb") as f:
+        f.write(buf.getvalue())
@@ -0,0 +1,306 @@
+"""
+fxmoney benchmark suite.
+
+    python -m benchmarks.run                          # run all, print table
+    python -m benchmarks.run --json out.json          # machine-readable results
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.25
+    python -m benchmarks.run -k get_rate              # only matching names
+
+Every benchmark runs against the synthetic ECB history from fixture.py in a
+temporary cache directory, so no network is used. Timings are the best of
+`--repeat` runs, reported per operation. With --compare the run exits with
+status 1 if any benchmark got slower than the baseline by more than the
+threshold (a fraction; 0.25 = 25 %). Baselines are machine-specific:
+regenerate with --json benchmarks/baseline.json on the reference machine.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable
+
+from . import fixture
+
+# name -> (setup returning the timed callable, operations per call)
+BENCHMARKS: dict[str, tuple[Callable[[], Callable[[], object]], int]] = {}
+
+
+def bench(name: str, ops: int):
+    def register(setup):
+        BENCHMARKS[name] = (setup, ops)
+        return setup
+    return register
+
+
+def _backend():
+    from fxmoney.rates import get_backend
+    return get_backend()
+
+
+def _dates(n: int, seed: int = 7) -> list[date]:
+    rnd = random.Random(seed)
+    span = (fixture.END - fixture.START).days
+    return [fixture.START + timedelta(days=rnd.randrange(span)) for _ in range(n)]
+
+
+# ----- rate loading ---------------------------------------------------------
+@bench("ecb_load_rates_csv", ops=1)
+def _load_csv():
+    from fxmoney.rates import ecb
+    backend = _backend()
+
+    def run():
+        os.remove(ecb.CACHE_SNAPSHOT)   # force the CSV parse (+ snapshot write)
+        backend._load_rates()
+    return run
+
+
+@bench("ecb_load_rates_snapshot", ops=1)
+def _load_snapshot():
+    backend = _backend()
+    backend._load_rates()
+    return backend._load_rates
+
+
+# ----- rate lookups ---------------------------------------------------------
+@bench("get_rate_latest", ops=10_000)
+def _rate_latest():
+    get_rate = _backend().get_rate
+    pairs = [("USD", "JPY"), ("GBP", "EUR"), ("EUR", "CHF"), ("SEK", "NOK")] * 2500
+
+    def run():
+        for src, tgt in pairs:
+            get_rate(src, tgt)
+    return run
+
+
+@bench("get_rate_historical", ops=10_000)
+def _rate_historical():
+    get_rate = _backend().get_rate
+    days = _dates(10_000)
+
+    def run():
+        for d in days:
+            get_rate("USD", "JPY", d)
+    return run
+
+
+@bench("get_rate_fallback_walk", ops=2_000)
+def _rate_fallback():
+    # ISK is unquoted for ~10 years: every lookup walks back to the last quote
+    get_rate = _backend().get_rate
+    start, end = fixture.PARTIAL["ISK"]
+    rnd = random.Random(3)
+    days = [start + timedelta(days=rnd.randrange((end - start).days)) for _ in range(2_000)]
+
+    def run():
+        for d in days:
+            get_rate("USD", "ISK", d)
+    return run
+
+
+@bench("get_series_10y_daily", ops=3_653)
+def _series():
+    # one call per 10-year range; ops counts the calendar days returned
+    backend = _backend()
+    start = date(2010, 1, 1)
+    end = start + timedelta(days=3_652)
+
+    def run():
+        backend.get_series("USD", "JPY", start, end)
+    return run
+
+
+# ----- Money arithmetic -----------------------------------------------------
+@bench("money_arithmetic", ops=10_000)
+def _arith():
+    from fxmoney import Money
+    a, b = Money("10.25", "EUR"), Money("1.10", "EUR")
+    factor = Decimal("1.07")
+
+    def run():
+        for _ in range(10_000):
+            (a + b) * factor - b / 3
+    return run
+
+
+@bench("money_compare_same_currency", ops=10_000)
+def _compare_same():
+    from fxmoney import Money
+    items = [Money(Decimal(i) / 7, "EUR") for i in range(10_000)]
+    pivot = Money("700", "EUR")
+
+    def run():
+        for m in items:
+            m < pivot
+    return run
+
+
+@bench("money_compare_cross_currency", ops=10_000)
+def _compare_cross():
+    from fxmoney import Money
+    _backend()
+    items = [Money(Decimal(i) / 7, "EUR") for i in range(10_000)]
+    pivot = Money("700", "USD")
+
+    def run():
+        for m in items:
+            m < pivot
+    return run
+
+
+# ----- conversion -----------------------------------------------------------
+@bench("convert_amount", ops=10_000)
+def _convert_amount():
+    from fxmoney.rates import convert_amount
+    _backend()
+    amount = Decimal("123.45")
+    days = _dates(100)
+
+    def run():
+        for _ in range(100):
+            for d in days:
+                convert_amount(amount, "GBP", "JPY", d)
+    return run
+
+
+@bench("convert_many", ops=100_000)
+def _convert_many():
+    from fxmoney.rates import convert_many
+    _backend()
+    rnd = random.Random(5)
+    amounts = [Decimal(rnd.randrange(1, 10**6)) / 100 for _ in range(100_000)]
+    srcs = [rnd.choice(fixture.CURRENCIES[:10]) for _ in amounts]
+    days = [d for d in _dates(250) for _ in range(400)]
+
+    def run():
+        convert_many(amounts, srcs, "EUR", days)
+    return run
+
+
+# ----- serialization --------------------------------------------------------
+@bench("money_to_dict", ops=10_000)
+def _to_dict():
+    from fxmoney import Money
+    items = [Money(Decimal(i) / 7, "EUR") for i in range(10_000)]
+
+    def run():
+        for m in items:
+            m.to_dict()
+    return run
+
+
+@bench("pydantic_dump_large_model", ops=10_000)
+def _pydantic():
+    try:
+        from pydantic import BaseModel, ConfigDict
+    except ImportError:
+        return None
+    from fxmoney import Money
+
+    class Ledger(BaseModel):
+        model_config = ConfigDict(arbitrary_types_allowed=True)
+        entries: list[Money]
+
+    ledger = Ledger(entries=[Money(Decimal(i) / 7, "JPY" if i % 3 else "EUR") for i in range(10_000)])
+    return ledger.model_dump_json
+
+
+# ----- CLI ------------------------------------------------------------------
+_CLI = """
+import sys
+from benchmarks.fixture import point_at
+point_at(sys.argv.pop(1))
+from fxmoney.cli import main
+main()
+"""
+
+
+@bench("cli_cold_start", ops=1)
+def _cli():
+    from fxmoney.rates import ecb
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    cmd = [sys.executable, "-c", _CLI, ecb.CACHE_DIR, "convert", "100", "USD", "EUR"]
+
+    def run():
+        subprocess.run(cmd, cwd=root, check=True, stdout=subprocess.DEVNULL)
+    return run
+
+
+# ----- driver ---------------------------------------------------------------
+def run_benchmarks(names: list[str], repeat: int) -> dict[str, dict[str, float]]:
+    results = {}
+    for name in names:
+        setup, ops = BENCHMARKS[name]
+        fn = setup()
+        if fn is None:   # optional dependency missing
+            continue
+        fn()             # warm-up (builds caches, snapshots, imports)
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        results[name] = {"ops": ops, "best_s": best, "us_per_op": best / ops * 1e6}
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Names of benchmarks slower than baseline by more than `threshold`."""
+    slower = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if base and res["us_per_op"] > base["us_per_op"] * (1 + threshold):
+            slower.append(name)
+    return slower
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", dest="pattern", default="", help="Only run benchmarks containing this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark (best is kept)")
+    parser.add_argument("--json", dest="json_out", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown (fraction)")
+    args = parser.parse_args(argv)
+
+    names = [n for n in BENCHMARKS if args.pattern in n]
+    with tempfile.TemporaryDirectory(prefix="fxmoney-bench-") as cache:
+        fixture.use_cache(cache)
+        results = run_benchmarks(names, args.repeat)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    print(f"{'benchmark':32} {'us/op':>12} {'baseline':>12} {'ratio':>7}")
+    for name, res in results.items():
+        base = baseline.get(name)
+        ratio = f"{res['us_per_op'] / base['us_per_op']:.2f}" if base else "-"
+        base_txt = f"{base['us_per_op']:.3f}" if base else "-"
+        print(f"{name:32} {res['us_per_op']:12.3f} {base_txt:>12} {ratio:>7}")
+
+    if args.json_out:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    slower = compare(results, baseline, args.threshold)
+    if slower:
+        print(f"slower than baseline by > {args.threshold:.0%}: {', '.join(slower)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
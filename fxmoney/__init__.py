@@ -5,6 +5,8 @@ Version 0.1.0-alpha
 
 from .config import settings, set_base_currency, set_fallback_mode, set_timeout
 from .core import Money
+from .moneyarray import MoneyArray
+from .bag import MoneyBag
 from .rates import install_backend, get_backend
 
 # Register Pydantic support if available
@@ -15,6 +17,8 @@ except ImportError:
 
 __all__ = [
     "Money",
+    "MoneyArray",
+    "MoneyBag",
     "settings",
     "set_base_currency",
     "set_fallback_mode",
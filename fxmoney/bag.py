@@ -0,0 +1,129 @@
+"""
+MoneyBag for fxmoney: multi-currency aggregation without per-step conversion.
+- amounts are summed per currency with plain Decimal addition
+- total(target, date=None, fallback=None)   one rate lookup per currency
+- accepts Money, MoneyArray and other MoneyBags
+"""
+
+from __future__ import annotations
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Iterator, Optional, Union
+
+from .core import Money
+from .moneyarray import MoneyArray
+from .rates import convert_amount
+
+Addable = Union[Money, MoneyArray, "MoneyBag"]
+
+
+class MoneyBag:
+    """Per-currency running totals, converted only when asked for a total."""
+
+    __slots__ = ("_totals",)
+
+    def __init__(self, items: Iterable[Addable] = ()):
+        self._totals: dict[str, Decimal] = {}
+        for item in items:
+            self.add(item)
+
+    # ----- accumulation -----------------------------------------------------
+    def add(self, item: Addable) -> MoneyBag:
+        """Add in place and return self."""
+        totals = self._totals
+        if isinstance(item, Money):
+            totals[item.currency] = totals.get(item.currency, 0) + item.amount
+        elif isinstance(item, MoneyBag):
+            for cur, amt in item._totals.items():
+                totals[cur] = totals.get(cur, 0) + amt
+        elif isinstance(item, MoneyArray):
+            for cur, m in item.group_by_currency().items():
+                totals[cur] = totals.get(cur, 0) + m.amount
+        else:
+            raise TypeError(f"cannot add {type(item).__name__} to MoneyBag")
+        return self
+
+    def sub(self, item: Addable) -> MoneyBag:
+        """Subtract in place and return self."""
+        return self.add(-MoneyBag([item]))
+
+    def copy(self) -> MoneyBag:
+        bag = MoneyBag()
+        bag._totals = dict(self._totals)
+        return bag
+
+    def __add__(self, other: Addable) -> MoneyBag:
+        if not isinstance(other, (Money, MoneyArray, MoneyBag)):
+            return NotImplemented
+        return self.copy().add(other)
+
+    def __radd__(self, other) -> MoneyBag:
+        # allows sum(bags) (start=0) and Money + MoneyBag
+        if isinstance(other, int) and other == 0:
+            return self.copy()
+        return self.__add__(other)
+
+    def __iadd__(self, other: Addable) -> MoneyBag:
+        if not isinstance(other, (Money, MoneyArray, MoneyBag)):
+            return NotImplemented
+        return self.add(other)
+
+    def __sub__(self, other: Addable) -> MoneyBag:
+        if not isinstance(other, (Money, MoneyArray, MoneyBag)):
+            return NotImplemented
+        return self.copy().sub(other)
+
+    def __isub__(self, other: Addable) -> MoneyBag:
+        if not isinstance(other, (Money, MoneyArray, MoneyBag)):
+            return NotImplemented
+        return self.sub(other)
+
+    def __neg__(self) -> MoneyBag:
+        bag = MoneyBag()
+        bag._totals = {cur: -amt for cur, amt in self._totals.items()}
+        return bag
+
+    # ----- access -----------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    def __iter__(self) -> Iterator[Money]:
+        for cur, amt in self._totals.items():
+            yield Money._make(amt, cur)
+
+    def __contains__(self, currency: str) -> bool:
+        return currency.upper() in self._totals
+
+    def __getitem__(self, currency: str) -> Money:
+        cur = currency.upper()
+        return Money(self._totals.get(cur, 0), cur)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MoneyBag):
+            return NotImplemented
+        mine = {c: a for c, a in self._totals.items() if a}
+        theirs = {c: a for c, a in other._totals.items() if a}
+        return mine == theirs
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        inner = ", ".join(repr(m) for m in self)
+        return f"MoneyBag([{inner}])"
+
+    # ----- conversion -------------------------------------------------------
+    def total(
+        self,
+        target: str,
+        on_date: Optional[date] = None,
+        fallback: Optional[str] = None
+    ) -> Money:
+        """
+        Sum of all currencies in `target` (ISO code).
+        Each currency is converted once; `fallback` overrides the global setting.
+        """
+        tgt = target.upper()
+        total = Decimal(0)
+        for cur, amt in self._totals.items():
+            total += amt if cur == tgt else convert_amount(amt, cur, tgt, on_date, fallback)
+        return Money._make(total, tgt)
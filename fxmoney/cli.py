@@ -1,15 +1,29 @@
 # fxmoney/cli.py
 
 """
-CLI for fxmoney: provides the `convert` command.
+CLI for fxmoney: provides the `convert` and `convert-file` commands.
+- convert        one amount, one rate lookup
+- convert-file   streams a CSV/JSONL ledger of (amount, currency, date) rows
+                 in fixed-size chunks through convert_many(), optionally
+                 spread over worker processes, writing rows as they finish
 """
 
 import argparse
-from datetime import datetime
+import csv
+import json
+import sys
+from collections import deque
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Iterator, Optional
 
+from .config import quantum
 from .core import Money
-from .rates import install_backend, get_backend
-from .rates.ecb import ECBBackend
+from .rates import convert_amount, convert_many
+from .rates.exceptions import MissingRateError
+
+CHUNK_SIZE = 10_000
 
 
 def main():
@@ -44,12 +58,58 @@ def main():
         help="Show exchange rate and then the result"
     )
 
+    # convert-file subcommand
+    conf = sub.add_parser(
+        "convert-file", help="Convert every row of a CSV or JSONL ledger"
+    )
+    conf.add_argument("input", type=str, help="Input file ('-' for stdin)")
+    conf.add_argument("tgt",   type=str, help="Target currency code (e.g. EUR)")
+    conf.add_argument(
+        "-o", "--output",
+        type=str,
+        default="-",
+        help="Output file (default: stdout)"
+    )
+    conf.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        default=None,
+        help="Input/output format (default: from the input file extension, else csv)"
+    )
+    conf.add_argument("--amount-field",   default="amount",   help="Amount column/key")
+    conf.add_argument("--currency-field", default="currency", help="Currency column/key")
+    conf.add_argument(
+        "--date-field",
+        default="date",
+        help="Date column/key (YYYY-MM-DD; missing or empty: latest rate)"
+    )
+    conf.add_argument(
+        "--fallback",
+        choices=["last", "raise"],
+        default=None,
+        help="Override fallback mode ('last' or 'raise')"
+    )
+    conf.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help=f"Rows converted per batch (default: {CHUNK_SIZE})"
+    )
+    conf.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Worker processes (default: 0, convert in this process)"
+    )
+    conf.add_argument(
+        "--progress",
+        action="store_true",
+        help="Report the number of converted rows on stderr"
+    )
+
     args = parser.parse_args()
 
     if args.command == "convert":
-        # ensure ECB backend is active by default
-        install_backend(ECBBackend())
-
         # parse optional date
         on_date = (
             datetime.strptime(args.date, "%Y-%m-%d").date()
@@ -57,14 +117,137 @@ def main():
             else None
         )
 
-        m = Money(args.amount, args.src)
-        result = m.to(args.tgt, on_date, args.fallback)
+        # one lookup serves both the rate line and the result
+        src, tgt = args.src.upper(), args.tgt.upper()
+        rate = convert_amount(Decimal(1), src, tgt, on_date, args.fallback)
+        result = Money(Decimal(args.amount) * rate, tgt)
 
         if args.verbose:
-            # fetch the raw rate for 1 unit
-            backend = get_backend()
-            rate = backend.get_rate(args.src.upper(), args.tgt.upper(), on_date)
-            print(f"Rate ({args.src.upper()}→{args.tgt.upper()}): {rate}")
+            print(f"Rate ({src}→{tgt}): {rate}")
             print(f"Result: {result}")
         else:
             print(result)
+
+    elif args.command == "convert-file":
+        if args.chunk_size < 1:
+            parser.error("--chunk-size must be positive")
+        try:
+            convert_file(
+                args.input, args.output, args.tgt,
+                fmt=args.format,
+                fields=(args.amount_field, args.currency_field, args.date_field),
+                fallback=args.fallback,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                progress=args.progress,
+            )
+        except (MissingRateError, ValueError, OSError) as e:
+            parser.exit(1, f"fxmoney: error: {e}\n")
+
+
+# ----- convert-file ---------------------------------------------------------
+def convert_file(
+    src_path: str,
+    dst_path: str,
+    target: str,
+    fmt: Optional[str] = None,
+    fields: tuple[str, str, str] = ("amount", "currency", "date"),
+    fallback: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+    workers: int = 0,
+    progress: bool = False,
+) -> int:
+    """
+    Stream `src_path` to `dst_path`, adding the converted amount (quantized
+    to the target's minor units) and target currency to every row.
+    Memory stays bounded by chunk_size × max(workers, 1) × 2 rows.
+    Returns the number of rows written.
+    """
+    tgt = target.upper()
+    if fmt is None:
+        fmt = "jsonl" if src_path.endswith((".jsonl", ".ndjson")) else "csv"
+    src = sys.stdin if src_path == "-" else open(src_path, encoding="utf-8", newline="")
+    dst = sys.stdout if dst_path == "-" else open(dst_path, "w", encoding="utf-8", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(src)
+            # header first, so even an empty input yields the output schema
+            added = ("converted_amount", "converted_currency")
+            fieldnames = [f for f in reader.fieldnames or () if f not in added]
+            writer = csv.DictWriter(dst, fieldnames=[*fieldnames, *added])
+            writer.writeheader()
+        else:
+            reader = (json.loads(line) for line in src if line.strip())
+
+        written = 0
+        chunks = _chunks(reader, fields, chunk_size)
+        for rows, converted in _convert_chunks(chunks, tgt, fallback, workers):
+            q = quantum(tgt)
+            for row, amount in zip(rows, converted):
+                row["converted_amount"] = str(amount.quantize(q))
+                row["converted_currency"] = tgt
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                dst.writelines(json.dumps(row) + "\n" for row in rows)
+            written += len(rows)
+            if progress:
+                print(f"\rconverted {written} rows", end="", file=sys.stderr, flush=True)
+        if progress:
+            print(file=sys.stderr)
+        return written
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+
+def _chunks(reader, fields: tuple[str, str, str], size: int) -> Iterator[tuple[list, tuple]]:
+    """Yield (rows, (amounts, currencies, dates)) for `size` rows at a time."""
+    amount_key, currency_key, date_key = fields
+    start = 1
+    while True:
+        rows = list(islice(reader, size))
+        if not rows:
+            return
+        amounts, currencies, dates = [], [], []
+        for n, row in enumerate(rows, start):
+            try:
+                amounts.append(Decimal(str(row[amount_key])))
+                currencies.append(str(row[currency_key]))
+                day = row.get(date_key)
+                dates.append(date.fromisoformat(day) if day else None)
+            except KeyError as e:
+                raise ValueError(f"row {n}: missing field {e}") from None
+            except (InvalidOperation, ValueError) as e:
+                raise ValueError(f"row {n}: {e!r}") from None
+        start += len(rows)
+        yield rows, (amounts, currencies, dates)
+
+
+def _convert_chunk(target: str, fallback: Optional[str], columns: tuple) -> list[Decimal]:
+    amounts, currencies, dates = columns
+    return convert_many(amounts, currencies, target, dates, fallback)
+
+
+def _convert_chunks(chunks, target: str, fallback: Optional[str], workers: int):
+    """Yield (rows, converted) in input order, using up to `workers` processes."""
+    if workers <= 0:
+        for rows, columns in chunks:
+            yield rows, _convert_chunk(target, fallback, columns)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for rows, columns in chunks:
+            pending.append((rows, pool.submit(_convert_chunk, target, fallback, columns)))
+            # bounded window keeps memory constant on arbitrarily long inputs
+            if len(pending) >= 2 * workers:
+                rows, fut = pending.popleft()
+                yield rows, fut.result()
+        while pending:
+            rows, fut = pending.popleft()
+            yield rows, fut.result()
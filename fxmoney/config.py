@@ -5,10 +5,13 @@ Global settings for fxmoney:
 - request_timeout: HTTP timeout for REST backends
 - precision: global Decimal precision and rounding
 - currency_decimals: mapping ISO codes → minor-unit decimal places
+- cross_rate_rows: number of per-date cross-rate matrices kept by ECBBackend
+- quantum(code): Decimal(10) ** -decimals for a currency, cached per number
+  of places (changes to currency_decimals, in place or not, apply at once)
 """
 
 from dataclasses import dataclass, field
-from decimal import getcontext, ROUND_HALF_EVEN
+from decimal import Decimal, getcontext, ROUND_HALF_EVEN
 
 
 @dataclass
@@ -24,6 +27,9 @@ class _Settings:
         "AUD": 2, "CAD": 2, "CNY": 2, "KRW": 0, "KWD": 3,
         # add more as needed...
     })
+    # per-date cross-rate matrices cached by ECBBackend (0 disables them);
+    # each costs roughly 180 KB with the full ECB currency list
+    cross_rate_rows: int = 8
 
     def apply(self):
         """Apply global Decimal settings (precision & rounding)."""
@@ -60,3 +66,23 @@ def set_currency_decimals(code: str, decimals: int):
 def set_all_currency_decimals(mapping: dict[str, int]):
     """Replace the entire currency_decimals mapping."""
     settings.currency_decimals = {k.upper(): v for k, v in mapping.items()}
+
+
+# ----- quantization exponents ----------------------------------------------
+# Decimal('0.01') etc. per number of places; the places are read from
+# settings.currency_decimals on every call, so in-place edits take effect
+_quanta: dict[int, Decimal] = {}
+
+
+def quantum(code: str) -> Decimal:
+    """Smallest unit of `code` (e.g. Decimal('0.01')); 2 places if unknown."""
+    places = settings.currency_decimals.get(code, 2)
+    q = _quanta.get(places)
+    if q is None:
+        q = _quanta[places] = Decimal(1).scaleb(-places)
+    return q
+
+
+def set_cross_rate_rows(rows: int):
+    """Set how many per-date cross-rate matrices may be cached (0 disables)."""
+    settings.cross_rate_rows = max(0, int(rows))
@@ -6,17 +6,34 @@ Money class for fxmoney:
 - comparisons  ==, <, <=, >, >=  (automatic FX conversion)
 - to(target, date=None, fallback=None)   convert currency, optional historical date,
                                          optional per-call fallback override
+- await ato(target, date=None, fallback=None)   same, without blocking the event loop
 - per-currency quantization for presentation
 - to_dict()/from_dict()   minimal dict for JSON
+- quantize_many(items) / to_dicts(items)   bulk variants for lists of Money
 """
 
 from __future__ import annotations
+import sys
 from decimal import Decimal
 from datetime import date
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
-from .config import settings
-from .rates import convert_amount  # updated to accept per-call fallback
+from .config import quantum
+from .rates import aconvert_amount, convert_amount  # updated to accept per-call fallback
+
+# interned upper-case currency codes, keyed by the spelling passed in
+_CODES: dict[str, str] = {}
+_MAX_CODES = 4096
+
+
+def _currency_code(code: str) -> str:
+    """Upper-case, interned currency code (memoized per input spelling)."""
+    cur = _CODES.get(code)
+    if cur is None:
+        cur = sys.intern(code.upper())
+        if len(_CODES) < _MAX_CODES:
+            _CODES[code] = cur
+    return cur
 
 
 class Money:
@@ -26,8 +43,16 @@ class Money:
     __slots__ = ("amount", "currency")
 
     def __init__(self, amount: Any, currency: str):
-        self.amount = Decimal(str(amount))
-        self.currency = currency.upper()
+        self.amount = amount if type(amount) is Decimal else Decimal(str(amount))
+        self.currency = _currency_code(currency)
+
+    @classmethod
+    def _make(cls, amount: Decimal, currency: str) -> Money:
+        """Trusted constructor: `amount` is a Decimal, `currency` already normalized."""
+        obj = object.__new__(cls)
+        obj.amount = amount
+        obj.currency = currency
+        return obj
 
     # ----- internal helpers -------------------------------------------------
     def _coerce_amount(
@@ -43,30 +68,33 @@ class Money:
 
     def _quantize(self, amt: Decimal) -> Decimal:
         """Quantize amt to minor units for this currency."""
-        places = settings.currency_decimals.get(self.currency, 2)
-        factor = Decimal(1).scaleb(-places)
-        return amt.quantize(factor)
+        return amt.quantize(quantum(self.currency))
 
     # ----- arithmetic -------------------------------------------------------
     def __add__(self, other: Money) -> Money:
         if not isinstance(other, Money):
             return NotImplemented
         raw = self.amount + self._coerce_amount(other)
-        return Money(raw, self.currency)
+        return Money._make(raw, self.currency)
 
     def __sub__(self, other: Money) -> Money:
         if not isinstance(other, Money):
             return NotImplemented
         raw = self.amount - self._coerce_amount(other)
-        return Money(raw, self.currency)
+        return Money._make(raw, self.currency)
+
+    @staticmethod
+    def _factor(value: Any) -> Decimal | int:
+        """Decimal and int operands are used as-is; anything else via str()."""
+        return value if type(value) in (Decimal, int) else Decimal(str(value))
 
     def __mul__(self, factor: int | float | Decimal) -> Money:
-        raw = self.amount * Decimal(str(factor))
-        return Money(raw, self.currency)
+        raw = self.amount * self._factor(factor)
+        return Money._make(raw, self.currency)
 
     def __truediv__(self, divisor: int | float | Decimal) -> Money:
-        raw = self.amount / Decimal(str(divisor))
-        return Money(raw, self.currency)
+        raw = self.amount / self._factor(divisor)
+        return Money._make(raw, self.currency)
 
     # ----- comparison -------------------------------------------------------
     def _pair(self, other: Money) -> tuple[Decimal, Decimal]:
@@ -96,11 +124,24 @@ class Money:
         Convert to target currency (ISO code).
         `on_date` for historical rate; `fallback` overrides global setting.
         """
-        tgt = target.upper()
+        tgt = _currency_code(target)
         if tgt == self.currency:
-            return Money(self.amount, self.currency)
+            return Money._make(self.amount, self.currency)
         raw = convert_amount(self.amount, self.currency, tgt, on_date, fallback)
-        return Money(raw, tgt)
+        return Money._make(raw, tgt)
+
+    async def ato(
+        self,
+        target: str,
+        on_date: Optional[date] = None,
+        fallback: Optional[str] = None
+    ) -> Money:
+        """Async to(): resolves the rate via aconvert_amount()."""
+        tgt = _currency_code(target)
+        if tgt == self.currency:
+            return Money._make(self.amount, self.currency)
+        raw = await aconvert_amount(self.amount, self.currency, tgt, on_date, fallback)
+        return Money._make(raw, tgt)
 
     # ----- representation & JSON helpers ----------------------------------
     def __repr__(self) -> str:
@@ -112,10 +153,22 @@ class Money:
 
     def to_dict(self) -> dict[str, str]:
         """Minimal dict for JSON serialization (quantized)."""
-        q = self._quantize(self.amount)
-        return {"amount": str(q), "currency": self.currency}
+        return {"amount": str(self.amount.quantize(quantum(self.currency))), "currency": self.currency}
 
     @classmethod
     def from_dict(cls, d: dict[str, str]) -> Money:
         """Construct Money from dict."""
         return cls(d["amount"], d["currency"])
+
+
+def quantize_many(items: Iterable[Money]) -> list[Decimal]:
+    """Amounts of `items`, each quantized to its currency's minor units."""
+    return [m.amount.quantize(quantum(m.currency)) for m in items]
+
+
+def to_dicts(items: Iterable[Money]) -> list[dict[str, str]]:
+    """Money.to_dict() for every item, e.g. to serialize a list of prices."""
+    return [
+        {"amount": str(m.amount.quantize(quantum(m.currency))), "currency": m.currency}
+        for m in items
+    ]
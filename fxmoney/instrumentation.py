@@ -0,0 +1,157 @@
+"""
+Instrumentation for fxmoney: counters, duration histograms and listeners.
+- disabled by default; every hook in the library is guarded by one check of
+  `instrumentation.enabled`, so the cost when off is a global lookup
+- enable()/disable()                  switch recording on or off
+- add_listener(cb)/remove_listener()  cb(kind, name, value, labels) per event,
+                                      kind is "counter" or "histogram"
+- snapshot()/reset()                  in-process aggregates for exporters
+                                      (Prometheus, OpenTelemetry, logs, ...)
+
+Metrics (durations in seconds, histograms):
+- rate.lookup{backend}                backend calls made by the conversion functions
+- rate.fallback{source, reason}       counter: a rate was substituted
+  (source=convert: unit rate for a missing rate in "last" mode;
+   source=ecb: an earlier day was used; source=host: unit rate on HTTP errors)
+- cache.hit / cache.miss              counters of CachingBackend
+- ecb.refresh, ecb.download, ecb.load_rates{source}   refresh phases
+- ecb.refresh_error{error}            counter: background refresh failed
+- host.request{endpoint}              HTTP round trips of HostBackend
+- composite.timeout / composite.hedge / composite.circuit_open{backend}
+                                      counters of CompositeBackend tiers
+- updater.error{error}                counter: background updater run failed
+"""
+
+from __future__ import annotations
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+Listener = Callable[[str, str, float, dict], None]
+
+# upper bounds (seconds) of the histogram buckets; a final +Inf bucket is implicit
+BUCKETS = (1e-5, 1e-4, 1e-3, 0.01, 0.1, 1.0, 10.0, 60.0)
+
+enabled = False
+
+_listeners: list[Listener] = []
+_counters: dict[tuple, float] = {}
+_histograms: dict[tuple, Histogram] = {}
+_lock = threading.Lock()
+
+
+class Histogram:
+    """Cumulative-friendly bucket counts plus count and sum of observations."""
+
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+def enable() -> None:
+    """Start recording metrics and calling listeners."""
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    """Stop recording; collected values are kept until reset()."""
+    global enabled
+    enabled = False
+
+
+def add_listener(callback: Listener) -> None:
+    """Call `callback(kind, name, value, labels)` for every recorded event."""
+    with _lock:
+        _listeners.append(callback)
+
+
+def remove_listener(callback: Listener) -> None:
+    with _lock:
+        if callback in _listeners:
+            _listeners.remove(callback)
+
+
+def _key(name: str, labels: dict[str, Any]) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def count(name: str, value: float = 1, **labels: Any) -> None:
+    """Increment counter `name` (no-op while disabled)."""
+    if not enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+        listeners = list(_listeners)
+    for callback in listeners:
+        callback("counter", name, value, labels)
+
+
+def observe(name: str, seconds: float, **labels: Any) -> None:
+    """Record a duration in histogram `name` (no-op while disabled)."""
+    if not enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = Histogram()
+        hist.observe(seconds)
+        listeners = list(_listeners)
+    for callback in listeners:
+        callback("histogram", name, seconds, labels)
+
+
+@contextmanager
+def timed(name: str, **labels: Any) -> Iterator[None]:
+    """Observe the duration of the block in histogram `name`, even if it raises."""
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def snapshot() -> dict[str, list[dict[str, Any]]]:
+    """
+    Current values as plain data:
+    {"counters": [{name, labels, value}], "histograms": [{name, labels,
+    buckets: [(upper bound, count)], count, sum}]}; buckets are not cumulative.
+    """
+    with _lock:
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in _counters.items()
+        ]
+        histograms = [
+            {
+                "name": name,
+                "labels": dict(labels),
+                "buckets": list(zip((*BUCKETS, float("inf")), hist.buckets)),
+                "count": hist.count,
+                "sum": hist.sum,
+            }
+            for (name, labels), hist in _histograms.items()
+        ]
+    return {"counters": counters, "histograms": histograms}
+
+
+def reset() -> None:
+    """Forget all collected values (listeners stay registered)."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
@@ -35,7 +35,7 @@ else:
             any_schema,
             # single-arg serializer required by pydantic-core 2.33
             serialization=core_schema.plain_serializer_function_ser_schema(
-                lambda m: m.to_dict()
+                Money.to_dict
             ),
         )
 
@@ -0,0 +1,287 @@
+"""
+MoneyArray for fxmoney: a compact columnar container for many Money values.
+- amounts stored as int64 minor units (array 'q'), quantized per currency
+  via settings.currency_decimals; exact=True (or int64 overflow) keeps
+  unquantized Decimals instead
+- one shared currency code, or a per-element code index
+- vectorized +, -, *, /, comparisons (elementwise → list[bool])
+- to(target, on_date=None, fallback=None)   one rate lookup per currency
+- sum(), group_by_currency()
+"""
+
+from __future__ import annotations
+import operator
+from array import array
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Optional, Sequence, Union
+
+from .config import settings
+from .core import Money, to_dicts
+from .rates import convert_amount, convert_many
+
+
+class MoneyArray:
+    """Columnar sequence of money amounts with per-element or shared currency."""
+
+    __slots__ = ("_values", "_codes", "_currencies", "_scales", "_exact")
+
+    def __init__(
+        self,
+        amounts: Iterable[Any],
+        currency: Union[str, Sequence[str]],
+        exact: bool = False,
+    ):
+        amounts = [a if isinstance(a, Decimal) else Decimal(str(a)) for a in amounts]
+        if isinstance(currency, str):
+            currencies, codes = (currency.upper(),), None
+        else:
+            index: dict[str, int] = {}
+            codes = array("H", (index.setdefault(c.upper(), len(index)) for c in currency))
+            if len(codes) != len(amounts):
+                raise ValueError("amounts and currencies must have the same length")
+            currencies = tuple(index)
+        self._init(amounts, codes, currencies, exact)
+
+    def _init(self, amounts: list[Decimal], codes, currencies, exact: bool):
+        self._codes = codes
+        self._currencies = currencies
+        self._scales = tuple(settings.currency_decimals.get(c, 2) for c in currencies)
+        self._exact = exact
+        if not exact:
+            try:
+                self._values = array("q", (
+                    int(a.scaleb(s).to_integral_value())
+                    for a, s in zip(amounts, self._iter_scales())
+                ))
+                return
+            except OverflowError:
+                self._exact = True
+        self._values = amounts
+
+    @classmethod
+    def _new(cls, amounts: list[Decimal], codes, currencies, exact: bool) -> MoneyArray:
+        obj = cls.__new__(cls)
+        obj._init(amounts, codes, currencies, exact)
+        return obj
+
+    @classmethod
+    def from_money(cls, items: Iterable[Money], exact: bool = False) -> MoneyArray:
+        """Build from Money instances."""
+        items = list(items)
+        return cls([m.amount for m in items], [m.currency for m in items], exact)
+
+    # ----- element access ---------------------------------------------------
+    def _iter_scales(self) -> Iterator[int]:
+        if self._codes is None:
+            return iter(lambda: self._scales[0], None)
+        return (self._scales[c] for c in self._codes)
+
+    def _iter_currencies(self) -> Iterator[str]:
+        if self._codes is None:
+            return iter(lambda: self._currencies[0], None)
+        return (self._currencies[c] for c in self._codes)
+
+    @property
+    def amounts(self) -> list[Decimal]:
+        """Amounts as Decimal (minor units scaled back unless exact)."""
+        if self._exact:
+            return list(self._values)
+        return [Decimal(u).scaleb(-s) for u, s in zip(self._values, self._iter_scales())]
+
+    @property
+    def currencies(self) -> list[str]:
+        """Currency code of each element."""
+        return [c for c, _ in zip(self._iter_currencies(), self._values)]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[Money]:
+        for amt, cur in zip(self.amounts, self._iter_currencies()):
+            yield Money._make(amt, cur)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            # a new array over the sliced storage; nothing is materialised
+            return self._view(self._values[i], None if self._codes is None else self._codes[i])
+        value = self._values[i]
+        c = 0 if self._codes is None else self._codes[i]
+        amount = value if self._exact else Decimal(value).scaleb(-self._scales[c])
+        return Money._make(amount, self._currencies[c])
+
+    def __repr__(self) -> str:
+        if self._codes is None:
+            return f"MoneyArray([{', '.join(map(str, self.amounts))}], '{self._currencies[0]}')"
+        return f"MoneyArray({len(self)} items, currencies={list(self._currencies)})"
+
+    def as_numpy(self):
+        """Zero-copy int64 view of the minor units (not available with exact=True)."""
+        if self._exact:
+            raise TypeError("exact MoneyArray has no integer minor units")
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("MoneyArray.as_numpy() requires numpy") from e
+        return np.frombuffer(self._values, dtype=np.int64)
+
+    # ----- internal helpers -------------------------------------------------
+    def _same_layout(self, other: MoneyArray) -> bool:
+        """True if both store integer units at identical currencies and scales."""
+        return (
+            not self._exact and not other._exact
+            and self._codes is None and other._codes is None
+            and self._currencies == other._currencies
+            and self._scales == other._scales
+        )
+
+    def _coerce(
+        self,
+        other: Union[MoneyArray, Money],
+        on_date: Optional[date] = None,
+        fallback: Optional[str] = None,
+    ) -> list[Decimal]:
+        """Other's amounts converted into each element's currency (raw Decimal)."""
+        if isinstance(other, Money):
+            amounts = [other.amount] * len(self)
+            srcs = [other.currency] * len(self)
+        else:
+            if len(other) != len(self):
+                raise ValueError("MoneyArray operands must have the same length")
+            amounts, srcs = other.amounts, other.currencies
+        rates: dict[tuple[str, str], Decimal] = {}
+        out = []
+        for amt, src, tgt in zip(amounts, srcs, self._iter_currencies()):
+            if src != tgt:
+                rate = rates.get((src, tgt))
+                if rate is None:
+                    rate = rates[(src, tgt)] = convert_amount(Decimal(1), src, tgt, on_date, fallback)
+                amt = amt * rate
+            out.append(amt)
+        return out
+
+    def _with(self, amounts: list[Decimal]) -> MoneyArray:
+        return MoneyArray._new(amounts, self._codes, self._currencies, self._exact)
+
+    def _view(self, values, codes) -> MoneyArray:
+        """Same currencies, scales and storage kind over other values (no conversion)."""
+        obj = MoneyArray.__new__(MoneyArray)
+        obj._codes, obj._currencies, obj._scales = codes, self._currencies, self._scales
+        obj._exact, obj._values = self._exact, values
+        return obj
+
+    # ----- arithmetic -------------------------------------------------------
+    def __add__(self, other: Union[MoneyArray, Money]) -> MoneyArray:
+        if isinstance(other, MoneyArray) and self._same_layout(other):
+            if len(other) != len(self):
+                raise ValueError("MoneyArray operands must have the same length")
+            try:
+                return self._view(array("q", map(operator.add, self._values, other._values)), None)
+            except OverflowError:
+                pass   # beyond int64: take the exact Decimal path
+        if not isinstance(other, (MoneyArray, Money)):
+            return NotImplemented
+        return self._with(list(map(operator.add, self.amounts, self._coerce(other))))
+
+    def __sub__(self, other: Union[MoneyArray, Money]) -> MoneyArray:
+        if isinstance(other, MoneyArray) and self._same_layout(other):
+            if len(other) != len(self):
+                raise ValueError("MoneyArray operands must have the same length")
+            try:
+                return self._view(array("q", map(operator.sub, self._values, other._values)), None)
+            except OverflowError:
+                pass   # beyond int64: take the exact Decimal path
+        if not isinstance(other, (MoneyArray, Money)):
+            return NotImplemented
+        return self._with(list(map(operator.sub, self.amounts, self._coerce(other))))
+
+    def _factors(self, factor) -> list[Decimal]:
+        if isinstance(factor, (int, float, Decimal)):
+            factor = factor if isinstance(factor, (int, Decimal)) else Decimal(str(factor))
+            return [factor] * len(self)
+        factors = [f if isinstance(f, (int, Decimal)) else Decimal(str(f)) for f in factor]
+        if len(factors) != len(self):
+            raise ValueError("factors must match the MoneyArray length")
+        return factors
+
+    def __mul__(self, factor) -> MoneyArray:
+        if isinstance(factor, int) and not self._exact:
+            try:
+                return self._view(array("q", (u * factor for u in self._values)), self._codes)
+            except OverflowError:
+                pass   # beyond int64: take the exact Decimal path
+        return self._with(list(map(operator.mul, self.amounts, self._factors(factor))))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor) -> MoneyArray:
+        return self._with(list(map(operator.truediv, self.amounts, self._factors(divisor))))
+
+    # ----- comparison (elementwise) -----------------------------------------
+    def _compare(self, other, op) -> list[bool]:
+        if isinstance(other, MoneyArray) and self._same_layout(other) and len(other) == len(self):
+            return list(map(op, self._values, other._values))
+        if not isinstance(other, (MoneyArray, Money)):
+            return NotImplemented
+        return list(map(op, self.amounts, self._coerce(other)))
+
+    def __eq__(self, other): return self._compare(other, operator.eq)
+    def __ne__(self, other): return self._compare(other, operator.ne)
+    def __lt__(self, other): return self._compare(other, operator.lt)
+    def __le__(self, other): return self._compare(other, operator.le)
+    def __gt__(self, other): return self._compare(other, operator.gt)
+    def __ge__(self, other): return self._compare(other, operator.ge)
+
+    __hash__ = None
+
+    # ----- conversion & reductions ------------------------------------------
+    def to(
+        self,
+        target: str,
+        on_date: Optional[date] = None,
+        fallback: Optional[str] = None,
+    ) -> MoneyArray:
+        """Convert every element to `target`; one rate lookup per source currency."""
+        tgt = target.upper()
+        srcs = self._currencies[0] if self._codes is None else self.currencies
+        converted = convert_many(self.amounts, srcs, tgt, on_date, fallback)
+        return MoneyArray._new(converted, None, (tgt,), self._exact)
+
+    def group_by_currency(self) -> dict[str, Money]:
+        """Per-currency totals (no conversion)."""
+        totals: dict[int, Any] = {}
+        codes = self._codes if self._codes is not None else [0] * len(self)
+        for c, v in zip(codes, self._values):
+            totals[c] = totals.get(c, 0) + v
+        return {
+            self._currencies[c]: Money(
+                total if self._exact else Decimal(total).scaleb(-self._scales[c]),
+                self._currencies[c],
+            )
+            for c, total in sorted(totals.items())
+        }
+
+    def sum(
+        self,
+        target: Optional[str] = None,
+        on_date: Optional[date] = None,
+        fallback: Optional[str] = None,
+    ) -> Money:
+        """
+        Total as Money in `target` (default: currency of the first element).
+        Amounts are summed per currency first, so each currency is converted once.
+        """
+        groups = self.group_by_currency()
+        tgt = (target or (self._currencies[0] if self._currencies else settings.base_currency)).upper()
+        total = Decimal(0)
+        for cur, m in groups.items():
+            total += m.amount if cur == tgt else convert_amount(m.amount, cur, tgt, on_date, fallback)
+        return Money._make(total, tgt)
+
+    def quantize(self) -> MoneyArray:
+        """Copy rounded to each currency's minor units (settings.currency_decimals)."""
+        return MoneyArray._new(self.amounts, self._codes, self._currencies, False)
+
+    def to_dicts(self) -> list[dict[str, str]]:
+        """Quantized dicts for JSON, like Money.to_dict() per element."""
+        return to_dicts(self)
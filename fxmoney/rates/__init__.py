@@ -1,15 +1,26 @@
 """
 fxmoney – FX-Rate Backend Registry
-Default backend: ECBBackend with historical ECB rates.
+Default backend: ECBBackend with historical ECB rates, created lazily on
+first use so importing fxmoney has no I/O side effects.
+Async code may install an AsyncRateBackend; otherwise aconvert_amount()
+runs the sync backend in a worker thread.
+Backends may also offer get_rate_decimal() returning an exact Decimal; the
+conversion functions prefer it and skip the float → str → Decimal round-trip.
+get_series()/get_table() query a date range or a whole day at once; backends
+implementing them (ECB, Host) answer natively, others one lookup at a time.
 """
 
+import threading
 from datetime import date
 from decimal import Decimal
-from typing import Protocol, runtime_checkable, Optional
+from typing import Any, Iterable, Protocol, Sequence, Union, runtime_checkable, Optional
 
+from .. import instrumentation
 from ..config import settings
+from . import signals
 from .exceptions import MissingRateError
 from .ecb import ECBBackend
+from .series import Series, series_by_lookup, table_by_lookup
 
 @runtime_checkable
 class RateBackend(Protocol):
@@ -20,17 +31,82 @@ class RateBackend(Protocol):
         on_date: Optional[date] = None
     ) -> float: ...
 
-# install ECB by default
-_current_backend: RateBackend = ECBBackend()
+@runtime_checkable
+class DecimalRateBackend(Protocol):
+    """Optional extension of RateBackend: exact rates as Decimal."""
+    def get_rate_decimal(
+        self,
+        src: str,
+        tgt: str,
+        on_date: Optional[date] = None
+    ) -> Decimal: ...
+
+@runtime_checkable
+class SeriesRateBackend(Protocol):
+    """Optional extension of RateBackend: date-range and whole-day queries."""
+    def get_series(
+        self,
+        src: str,
+        tgt: str,
+        start: date,
+        end: date,
+        fill: Optional[str] = "ffill"
+    ) -> list[tuple[date, Decimal]]: ...
+
+    def get_table(
+        self,
+        on_date: Optional[date] = None,
+        currencies: Optional[Iterable[str]] = None
+    ) -> dict[str, Decimal]: ...
+
+@runtime_checkable
+class AsyncRateBackend(Protocol):
+    async def get_rate(
+        self,
+        src: str,
+        tgt: str,
+        on_date: Optional[date] = None
+    ) -> float: ...
+
+    async def get_rates(
+        self,
+        src: str,
+        tgts: Sequence[str],
+        on_date: Optional[date] = None
+    ) -> dict[str, float]: ...
+
+# ECB is installed by default, but only built on first use
+_current_backend: Optional[RateBackend] = None
+_default_lock = threading.Lock()
 
 def install_backend(backend: RateBackend):
-    """Switch the active FX-rate backend."""
+    """Switch the active FX-rate backend (notifies rate-change listeners)."""
     global _current_backend
     _current_backend = backend
+    signals.notify("install", backend)
 
 def get_backend() -> RateBackend:
-    """Return the active FX-rate backend."""
-    return _current_backend
+    """Return the active FX-rate backend (creating the default ECB one if needed)."""
+    global _current_backend
+    backend = _current_backend
+    if backend is None:
+        with _default_lock:
+            if _current_backend is None:
+                _current_backend = ECBBackend()
+            backend = _current_backend
+    return backend
+
+_current_async_backend: Optional[AsyncRateBackend] = None
+
+def install_async_backend(backend: Optional[AsyncRateBackend]):
+    """Switch the backend used by aconvert_amount() (None: use the sync one)."""
+    global _current_async_backend
+    _current_async_backend = backend
+    signals.notify("install", backend)
+
+def get_async_backend() -> Optional[AsyncRateBackend]:
+    """Return the installed async backend, if any."""
+    return _current_async_backend
 
 def convert_amount(
     amount: Decimal,
@@ -44,11 +120,177 @@ def convert_amount(
     `fallback` overrides global settings.fallback_mode (“last” or “raise”).
     """
     mode = fallback if fallback in ("last", "raise") else settings.fallback_mode
+    return amount * _lookup_rate(get_backend(), src, tgt, on_date, mode)
+
+async def aconvert_amount(
+    amount: Decimal,
+    src: str,
+    tgt: str,
+    on_date: Optional[date] = None,
+    fallback: Optional[str] = None
+) -> Decimal:
+    """
+    Async convert_amount(): awaits the installed AsyncRateBackend, or runs
+    the sync backend in a worker thread so the event loop never blocks.
+    """
+    import asyncio   # not at module level: keeps `import fxmoney` light
+
+    mode = fallback if fallback in ("last", "raise") else settings.fallback_mode
+    backend = _current_async_backend
     try:
-        rate = Decimal(str(_current_backend.get_rate(src, tgt, on_date)))
+        if backend is None:
+            sync = _current_backend
+            if sync is None:
+                # first use builds the default backend (may download): off-loop
+                sync = await asyncio.to_thread(get_backend)
+            rate = await asyncio.to_thread(_rate_getter(sync), src, tgt, on_date)
+        elif hasattr(backend, "get_rate_decimal"):
+            rate = await backend.get_rate_decimal(src, tgt, on_date)
+        else:
+            rate = Decimal(str(await backend.get_rate(src, tgt, on_date)))
     except MissingRateError:
         if mode == "last":
+            if instrumentation.enabled:
+                instrumentation.count("rate.fallback", source="convert", reason="missing")
             rate = Decimal(1)
         else:
             raise
     return amount * rate
+
+def get_series(
+    src: str,
+    tgt: str,
+    start: date,
+    end: date,
+    fill: Optional[str] = "ffill",
+    backend: Optional[RateBackend] = None
+) -> Series:
+    """
+    Rates src→tgt for every day in [start, end] as [(day, Decimal)].
+    fill="ffill" carries the last quote over weekends and holidays; fill=None
+    keeps only days with a fresh quote. Uses the active backend by default.
+    """
+    backend = backend or get_backend()
+    native = getattr(backend, "get_series", None)
+    if native is not None:
+        return native(src, tgt, start, end, fill)
+    return series_by_lookup(
+        _rate_getter(backend), src.upper(), tgt.upper(), start, end, fill,
+        getattr(backend, "effective_date", None)
+    )
+
+def get_table(
+    on_date: Optional[date] = None,
+    currencies: Optional[Iterable[str]] = None,
+    backend: Optional[RateBackend] = None
+) -> dict[str, Decimal]:
+    """
+    Rates from settings.base_currency to each of `currencies` on on_date as
+    {currency: Decimal}; currencies without a rate are left out.
+    """
+    backend = backend or get_backend()
+    native = getattr(backend, "get_table", None)
+    if native is not None:
+        return native(on_date, currencies)
+    return table_by_lookup(_rate_getter(backend), on_date, currencies)
+
+def _rate_getter(backend: RateBackend):
+    """backend.get_rate_decimal, or a wrapper turning get_rate's float into Decimal."""
+    exact = getattr(backend, "get_rate_decimal", None)
+    if exact is not None:
+        return exact
+    def rate(src: str, tgt: str, on_date: Optional[date] = None) -> Decimal:
+        return Decimal(str(backend.get_rate(src, tgt, on_date)))
+    rate.backend = backend
+    return rate
+
+def _lookup_rate(
+    backend: RateBackend,
+    src: str,
+    tgt: str,
+    on_date: Optional[date],
+    mode: str
+) -> Decimal:
+    """Rate src→tgt as Decimal; 1 if missing and `mode` is "last"."""
+    return _lookup_with(_rate_getter(backend), src, tgt, on_date, mode)
+
+def _lookup_with(getter, src: str, tgt: str, on_date: Optional[date], mode: str) -> Decimal:
+    try:
+        if not instrumentation.enabled:
+            return getter(src, tgt, on_date)
+        owner = getattr(getter, "__self__", None) or getattr(getter, "backend", None)
+        with instrumentation.timed("rate.lookup", backend=type(owner).__name__):
+            return getter(src, tgt, on_date)
+    except MissingRateError:
+        if mode == "last":
+            if instrumentation.enabled:
+                instrumentation.count("rate.fallback", source="convert", reason="missing")
+            return Decimal(1)
+        raise
+
+def convert_many(
+    amounts: Sequence[Any],
+    srcs: Union[str, Sequence[str]],
+    tgt: str,
+    dates: Union[None, date, Sequence[Optional[date]]] = None,
+    fallback: Optional[str] = None
+):
+    """
+    Convert many amounts to `tgt` in one call.
+
+    `srcs` and `dates` are either a single value applied to every amount or a
+    sequence aligned with `amounts`. Rows are grouped by (src, date), so each
+    distinct rate is looked up once. Returns a list of Decimal, or a float64
+    array when `amounts` is a NumPy array.
+    """
+    mode = fallback if fallback in ("last", "raise") else settings.fallback_mode
+    backend = get_backend()
+    tgt = tgt.upper()
+    if hasattr(amounts, "dtype"):
+        return _convert_many_numpy(backend, amounts, srcs, tgt, dates, mode)
+
+    n = len(amounts)
+    srcs = [srcs] * n if isinstance(srcs, str) else srcs
+    dates = [dates] * n if dates is None or isinstance(dates, date) else dates
+    if len(srcs) != n or len(dates) != n:
+        raise ValueError("amounts, srcs and dates must have the same length")
+
+    getter = _rate_getter(backend)
+    rates: dict[tuple[str, Optional[date]], Decimal] = {}
+    out: list[Decimal] = []
+    for amount, src, on_date in zip(amounts, srcs, dates):
+        key = (src.upper(), on_date)
+        rate = rates.get(key)
+        if rate is None:
+            rate = Decimal(1) if key[0] == tgt else _lookup_with(getter, key[0], tgt, on_date, mode)
+            rates[key] = rate
+        if not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
+        out.append(amount * rate)
+    return out
+
+def _convert_many_numpy(backend, amounts, srcs, tgt, dates, mode):
+    """NumPy path of convert_many: group via np.unique, one multiply for all rows."""
+    import numpy as np
+
+    n = len(amounts)
+    if isinstance(srcs, str):
+        src_arr = np.full(n, srcs.upper(), dtype=object)
+    else:
+        src_arr = np.array([s.upper() for s in srcs], dtype=object)
+    src_keys, src_idx = np.unique(src_arr, return_inverse=True)
+    if dates is None or isinstance(dates, date):
+        date_keys, date_idx = [dates], np.zeros(n, dtype=np.intp)
+    else:
+        date_keys, date_idx = np.unique(np.asarray(dates, dtype="datetime64[D]"), return_inverse=True)
+        date_keys = [None if np.isnat(d) else d.astype(object) for d in date_keys]
+    if len(src_idx) != n or len(date_idx) != n:
+        raise ValueError("amounts, srcs and dates must have the same length")
+
+    groups, group_idx = np.unique(src_idx * len(date_keys) + date_idx, return_inverse=True)
+    factors = np.empty(len(groups), dtype=np.float64)
+    for g, code in enumerate(groups):
+        src = src_keys[code // len(date_keys)]
+        on_date = date_keys[code % len(date_keys)]
+        factors[g] = 1.0 if src == tgt else float(_lookup_rate(backend, src, tgt, on_date, mode))
+    return np.asarray(amounts, dtype=np.float64) * factors[group_idx]
@@ -0,0 +1,94 @@
+"""
+fxmoney – asyncio FX-Rate Backends
+Async counterparts of ECBBackend and HostBackend for use with
+install_async_backend(). Downloads, parsing and HTTP calls run in a worker
+thread; lookups that can be answered from memory stay on the event loop.
+"""
+
+from __future__ import annotations
+import asyncio
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Optional, Sequence
+
+from .ecb import ECBBackend
+from .host import HostBackend
+
+
+class AsyncECBBackend:
+    """Async facade over ECBBackend; construction runs off-loop."""
+
+    def __init__(self, backend: Optional[ECBBackend] = None):
+        self._backend = backend
+        self._init_lock: Optional[asyncio.Lock] = None
+
+    async def _ensure(self) -> ECBBackend:
+        if self._backend is None:
+            if self._init_lock is None:
+                self._init_lock = asyncio.Lock()
+            async with self._init_lock:
+                if self._backend is None:
+                    # download (if stale) + parse in an executor
+                    self._backend = await asyncio.to_thread(ECBBackend)
+        return self._backend
+
+    async def get_rate(self, src: str, tgt: str, on_date: date | None = None) -> float:
+        backend = await self._ensure()
+        # in-memory lookup; refreshes happen in ECBBackend's own thread
+        return backend.get_rate(src, tgt, on_date)
+
+    async def get_rate_decimal(self, src: str, tgt: str, on_date: date | None = None) -> Decimal:
+        backend = await self._ensure()
+        return backend.get_rate_decimal(src, tgt, on_date)
+
+    async def get_rates(
+        self, src: str, tgts: Sequence[str], on_date: date | None = None
+    ) -> dict[str, float]:
+        return {tgt: await self.get_rate(src, tgt, on_date) for tgt in tgts}
+
+    async def get_series(
+        self, src: str, tgt: str, start: date, end: date, fill: Optional[str] = "ffill"
+    ) -> list[tuple[date, Decimal]]:
+        backend = await self._ensure()
+        # long ranges take milliseconds: keep them off the loop
+        return await asyncio.to_thread(backend.get_series, src, tgt, start, end, fill)
+
+    async def get_table(
+        self, on_date: date | None = None, currencies: Optional[Iterable[str]] = None
+    ) -> dict[str, Decimal]:
+        backend = await self._ensure()
+        return backend.get_table(on_date, currencies)
+
+
+class AsyncHostBackend:
+    """Async facade over HostBackend; HTTP requests run in a worker thread."""
+
+    def __init__(self, backend: Optional[HostBackend] = None, **kwargs):
+        self._backend = backend or HostBackend(**kwargs)
+
+    async def get_rate(self, src: str, tgt: str, on_date: date | None = None) -> float:
+        return await asyncio.to_thread(self._backend.get_rate, src, tgt, on_date)
+
+    async def get_rate_decimal(self, src: str, tgt: str, on_date: date | None = None) -> Decimal:
+        return await asyncio.to_thread(self._backend.get_rate_decimal, src, tgt, on_date)
+
+    async def get_rates(
+        self, src: str, tgts: Sequence[str], on_date: date | None = None
+    ) -> dict[str, float]:
+        # one table fetch serves every target; the rest are cache hits
+        def _all():
+            return {tgt: self._backend.get_rate(src, tgt, on_date) for tgt in tgts}
+        return await asyncio.to_thread(_all)
+
+    async def prefetch(self, start: date, end: date) -> int:
+        return await asyncio.to_thread(self._backend.prefetch, start, end)
+
+    async def get_series(
+        self, src: str, tgt: str, start: date, end: date, fill: Optional[str] = "ffill"
+    ) -> list[tuple[date, Decimal]]:
+        return await asyncio.to_thread(self._backend.get_series, src, tgt, start, end, fill)
+
+    async def get_table(
+        self, on_date: date | None = None, currencies: Optional[Iterable[str]] = None
+    ) -> dict[str, Decimal]:
+        return await asyncio.to_thread(self._backend.get_table, on_date, currencies)
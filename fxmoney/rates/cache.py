@@ -0,0 +1,129 @@
+"""
+Memoizing FX-Rate Backend for fxmoney
+Wraps any backend with a bounded LRU keyed on (src, tgt, effective date).
+Historical rates are kept until evicted; "latest" rates are dropped when the
+wrapped backend refreshes, after `latest_ttl` seconds (for backends that never
+announce refreshes, e.g. HostBackend), or when the active backend is swapped.
+"""
+
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+
+from .. import instrumentation
+from . import signals
+from ..config import settings
+
+# without effective_date(), requests this close to today may still change
+LATEST_WINDOW = timedelta(days=5)
+LATEST_TTL = 300.0   # seconds a "latest" rate is reused without a refresh signal
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class CachingBackend:
+    """LRU cache in front of another RateBackend."""
+
+    def __init__(self, backend: Any, maxsize: int = 4096, latest_ttl: float | None = LATEST_TTL):
+        self.backend = backend
+        self.maxsize = maxsize
+        # None: keep "latest" rates until the wrapped backend signals a refresh
+        self.latest_ttl = latest_ttl
+        self.hits = 0
+        self.misses = 0
+        self._historical: OrderedDict = OrderedDict()
+        self._latest: OrderedDict = OrderedDict()   # key -> (rate, expires at)
+        self._lock = threading.Lock()
+        signals.subscribe(self._on_rates_changed)
+
+    def __getattr__(self, name: str):
+        # expose the wrapped backend's extras (effective_date, ...)
+        if name == "backend":
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    def _key(self, src: str, tgt: str, on_date: date | None) -> tuple[tuple, bool]:
+        """Cache key and whether it refers to moving "latest" data."""
+        resolve = getattr(self.backend, "effective_date", None)
+        if on_date is None:
+            eff, latest = None, True
+        elif resolve is not None:
+            # dates resolving to the same published day share one entry
+            eff, latest = resolve(on_date), False
+        else:
+            eff, latest = on_date, on_date >= date.today() - LATEST_WINDOW
+        return (src, tgt, eff, settings.fallback_mode, settings.base_currency), latest
+
+    def get_rate(self, src: str, tgt: str, on_date: date | None = None) -> float:
+        return self._cached(self.backend.get_rate, float, src, tgt, on_date)
+
+    def get_rate_decimal(self, src: str, tgt: str, on_date: date | None = None) -> Decimal:
+        fetch = getattr(self.backend, "get_rate_decimal", None)
+        if fetch is None:
+            def fetch(src, tgt, on_date):
+                return Decimal(str(self.backend.get_rate(src, tgt, on_date)))
+        return self._cached(fetch, Decimal, src, tgt, on_date)
+
+    def _cached(self, fetch, kind: type, src: str, tgt: str, on_date: date | None):
+        """LRU lookup of one rate; float and Decimal results are cached apart."""
+        key, latest = self._key(src, tgt, on_date)
+        key += (kind,)
+        store = self._latest if latest else self._historical
+        with self._lock:
+            rate = store.get(key)
+            if latest and rate is not None:
+                rate, expires = rate
+                if expires <= time.monotonic():
+                    del store[key]
+                    rate = None
+            if rate is not None:
+                self.hits += 1
+                store.move_to_end(key)
+            else:
+                self.misses += 1
+        if rate is not None:
+            if instrumentation.enabled:
+                instrumentation.count("cache.hit")
+            return rate
+        if instrumentation.enabled:
+            instrumentation.count("cache.miss")
+        rate = fetch(src, tgt, on_date)
+        with self._lock:
+            if latest:
+                ttl = self.latest_ttl
+                store[key] = (rate, time.monotonic() + ttl if ttl is not None else float("inf"))
+            else:
+                store[key] = rate
+            if len(store) > self.maxsize:
+                store.popitem(last=False)
+        return rate
+
+    # ----- invalidation -----------------------------------------------------
+    def invalidate(self, latest_only: bool = True) -> None:
+        """Drop cached "latest" rates (or everything with latest_only=False)."""
+        with self._lock:
+            self._latest.clear()
+            if not latest_only:
+                self._historical.clear()
+
+    def cache_clear(self) -> None:
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._latest.clear()
+            self._historical.clear()
+            self.hits = self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            size = len(self._historical) + len(self._latest)
+            return CacheInfo(self.hits, self.misses, self.maxsize, size)
+
+    def _on_rates_changed(self, event: str, source: Any) -> None:
+        if event == "install" and source is not self:
+            self.invalidate(latest_only=False)
+        elif event == "refresh" and source is self.backend:
+            self.invalidate()
@@ -0,0 +1,231 @@
+"""
+Composite FX-Rate Backend for fxmoney
+Chains several backends into tiers, e.g. cache → ECB snapshot → REST:
+- tiers are asked in order; a missing rate or a failure falls through to
+  the next tier, and MissingRateError is raised only if every tier fails
+- per-tier timeouts: slow calls run in a worker thread and are abandoned
+  after `timeout` seconds
+- hedging: with `hedge_after`, the next tier is started in parallel once the
+  current one has not answered within that many seconds; the first rate wins
+- circuit breaker: after `failure_threshold` consecutive provider failures
+  (errors or timeouts, not missing rates) a tier is skipped for `reset_after`
+  seconds, then a single trial call decides whether it is closed again
+- tiers must report provider failures: a backend with a `fallback` option
+  (HostBackend) is only accepted with fallback="raise"
+"""
+
+from __future__ import annotations
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date
+from decimal import Decimal
+from typing import Any, Optional, Sequence, Union
+
+from .. import instrumentation
+from .exceptions import MissingRateError, RateProviderError
+
+
+class Tier:
+    """One backend of a CompositeBackend with its timeout and circuit breaker."""
+
+    def __init__(
+        self,
+        backend: Any,
+        timeout: Optional[float] = None,
+        failure_threshold: int = 5,
+        reset_after: float = 30.0,
+    ):
+        self.backend = backend
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.name = type(backend).__name__
+        if getattr(backend, "fallback", "raise") != "raise":
+            # e.g. HostBackend(): a unit rate on HTTP errors would never fail over
+            raise ValueError(
+                f"{self.name} tier returns a unit rate when its provider fails; "
+                "create it with fallback='raise'"
+            )
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """"closed", "open" or "half-open"."""
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() >= self.opened_at + self.reset_after else "open"
+
+    def acquire(self) -> bool:
+        """May a call go to this tier now? Half-open admits one trial call."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._trial or time.monotonic() < self.opened_at + self.reset_after:
+                return False
+            self._trial = True
+            return True
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def failed(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                if self.opened_at is None and instrumentation.enabled:
+                    instrumentation.count("composite.circuit_open", backend=self.name)
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+    def rate(self, src: str, tgt: str, on_date: date | None) -> Decimal:
+        exact = getattr(self.backend, "get_rate_decimal", None)
+        if exact is not None:
+            return exact(src, tgt, on_date)
+        return Decimal(str(self.backend.get_rate(src, tgt, on_date)))
+
+    def __repr__(self) -> str:
+        return f"Tier({self.name}, timeout={self.timeout}, state={self.state!r})"
+
+
+class CompositeBackend:
+    """Tiered RateBackend with timeouts, hedged requests and circuit breaking."""
+
+    def __init__(
+        self,
+        backends: Sequence[Any],
+        timeouts: Union[None, float, Sequence[Optional[float]]] = None,
+        hedge_after: Optional[float] = None,
+        failure_threshold: int = 5,
+        reset_after: float = 30.0,
+        max_workers: int = 8,
+    ):
+        if not backends:
+            raise ValueError("CompositeBackend needs at least one backend")
+        if timeouts is None or isinstance(timeouts, (int, float)):
+            timeouts = [timeouts] * len(backends)
+        if len(timeouts) != len(backends):
+            raise ValueError("timeouts must match the number of backends")
+        self.tiers = [
+            Tier(b, t, failure_threshold, reset_after) for b, t in zip(backends, timeouts)
+        ]
+        self.hedge_after = hedge_after
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Worker threads for timed and hedged calls, created on first use."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        self._max_workers, thread_name_prefix="fxmoney-composite"
+                    )
+        return self._executor
+
+    def get_rate(self, src: str, tgt: str, on_date: date | None = None) -> float:
+        return float(self.get_rate_decimal(src, tgt, on_date))
+
+    def get_rate_decimal(self, src: str, tgt: str, on_date: date | None = None) -> Decimal:
+        """Rate from the first tier that answers; MissingRateError if none does."""
+        errors: list[str] = []
+        tiers = iter(self.tiers)
+        pending: dict[Future, tuple[Tier, float]] = {}   # future → (tier, deadline)
+        launched_at = 0.0
+        exhausted = False
+
+        try:
+            while True:
+                now = time.monotonic()
+                hedging = self.hedge_after is not None and not exhausted
+                hedge = hedging and pending and now >= launched_at + self.hedge_after
+                if not pending or hedge:
+                    tier = None if exhausted else self._next_tier(tiers, errors)
+                    if tier is None:
+                        exhausted = True
+                        if not pending:
+                            raise MissingRateError(
+                                f"No rate for {src}->{tgt} on {on_date}: " + "; ".join(errors)
+                            )
+                    else:
+                        if hedge and instrumentation.enabled:
+                            instrumentation.count("composite.hedge", backend=tier.name)
+                        if tier.timeout is None and self.hedge_after is None:
+                            # nothing to bound or race: call inline
+                            try:
+                                rate = tier.rate(src, tgt, on_date)
+                            except Exception as e:
+                                self._settle(tier, e, errors)
+                                continue
+                            tier.succeeded()
+                            return rate
+                        deadline = float("inf") if tier.timeout is None else now + tier.timeout
+                        pending[self.executor.submit(tier.rate, src, tgt, on_date)] = (tier, deadline)
+                        launched_at = now
+                        continue
+
+                # wait for an answer, a timeout or the next hedge, whichever is first
+                wake = min(deadline for _, deadline in pending.values())
+                if self.hedge_after is not None and not exhausted:
+                    wake = min(wake, launched_at + self.hedge_after)
+                timeout = None if wake == float("inf") else max(0.0, wake - time.monotonic())
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    tier, _ = pending.pop(fut)
+                    try:
+                        rate = fut.result()
+                    except Exception as e:
+                        self._settle(tier, e, errors)
+                        continue
+                    tier.succeeded()
+                    return rate
+                now = time.monotonic()
+                for fut, (tier, deadline) in list(pending.items()):
+                    if now >= deadline:
+                        # abandoned: the worker finishes in the background
+                        del pending[fut]
+                        tier.failed()
+                        errors.append(f"{tier.name}: timed out after {tier.timeout}s")
+                        if instrumentation.enabled:
+                            instrumentation.count("composite.timeout", backend=tier.name)
+        finally:
+            # calls still running (lost a hedge race) settle their tier later
+            for fut, (tier, _) in pending.items():
+                fut.add_done_callback(lambda f, tier=tier: self._settle_late(tier, f))
+
+    def _next_tier(self, tiers, errors: list[str]) -> Optional[Tier]:
+        for tier in tiers:
+            if tier.acquire():
+                return tier
+            errors.append(f"{tier.name}: circuit open")
+        return None
+
+    @staticmethod
+    def _settle(tier: Tier, error: Exception, errors: list[str]) -> None:
+        """Book a failed call: missing rates keep the breaker closed, errors count."""
+        if isinstance(error, MissingRateError) and not isinstance(error, RateProviderError):
+            tier.succeeded()   # answered "no such rate": the provider is healthy
+        else:
+            tier.failed()
+        errors.append(f"{tier.name}: {error}")
+
+    def _settle_late(self, tier: Tier, fut: Future) -> None:
+        error = fut.exception()
+        if error is None:
+            tier.succeeded()
+        else:
+            self._settle(tier, error, [])
+
+    def close(self) -> None:
+        """Shut down the worker threads (abandoned calls are not waited for)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
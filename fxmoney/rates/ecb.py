@@ -4,131 +4,560 @@
 ECB FX-Rate Backend for fxmoney
 Loads historical & current exchange rates exclusively via the ECB ZIP download,
 then caches and parses the embedded CSV.
-Thread-safe on-demand refresh.
+The parsed table is kept as a binary snapshot next to the ZIP, so later
+startups map it instead of re-parsing the CSV.
+Incremental refresh: once a history exists, only the ECB 90-day feed is
+fetched and its new days are appended to the table and to a small side CSV;
+the full ZIP is downloaded again only on first run or when the feed no longer
+bridges the gap.
+Non-blocking refresh: lookups always read the current immutable table; once
+it expires, a background thread builds the new one and swaps it in.
+Cross rates: per-date src→tgt matrices are built for dates asked for more
+than once and cached for the settings.cross_rate_rows most recently used.
+Range queries: get_series() and get_table() answer a whole date range or a
+whole day from one snapshot of the table.
 """
 
 from __future__ import annotations
-import csv
+import errno
+import hashlib
 import io
 import os
 import threading
-import zipfile
-from datetime import date, datetime, timedelta
-from decimal import Decimal, InvalidOperation
-import requests
+import time
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable
 
+from .. import instrumentation
+from . import signals
+from ._filelock import FileLock
 from .exceptions import MissingRateError
+from .series import Series, check_fill
+from .table import CrossRates, RateTable
 from ..config import settings
 
 ZIP_URL    = "https://www.ecb.europa.eu/stats/eurofxref/eurofxref-hist.zip"
+FEED_URL   = "https://www.ecb.europa.eu/stats/eurofxref/eurofxref-hist-90d.xml"
 CACHE_DIR  = os.path.join(os.path.expanduser("~"), ".fxmoney")
 CACHE_ZIP  = os.path.join(CACHE_DIR, "eurofxref-hist.zip")
+CACHE_CSV  = os.path.join(CACHE_DIR, "eurofxref-hist.csv")
+CACHE_SNAPSHOT = os.path.join(CACHE_DIR, "eurofxref-hist.fxrt")
+CACHE_INCR = os.path.join(CACHE_DIR, "eurofxref-incr.csv")
+CACHE_LOCK = os.path.join(CACHE_DIR, "eurofxref.lock")
 DATE_FMT   = "%Y-%m-%d"
+MAX_AGE     = 24 * 3600   # seconds until the cached ZIP is refreshed
+RETRY_DELAY = 300         # seconds before retrying a failed refresh
+SHARED_POLL = 60          # seconds between generation checks in shared mode
 
 
 class ECBBackend:
-    """FX backend using the ECB ZIP file with thread-safe cache refresh."""
+    """FX backend using the ECB ZIP file with background cache refresh."""
 
     _lock = threading.Lock()
 
-    def __init__(self):
+    def __init__(self, incremental: bool = True, shared: bool = False):
         os.makedirs(CACHE_DIR, exist_ok=True)
-        with ECBBackend._lock:
-            if not self._is_cache_fresh():
-                self._download_and_extract()
-            self._rates = self._load_rates()
+        self.incremental = incremental
+        self.shared = shared
+        self._refresh_lock = threading.Lock()
+        self._expires_at = 0.0
+        self.refresh()
+
+    @staticmethod
+    def _fetched_at() -> float:
+        """Time of the last successful fetch (full ZIP or incremental feed)."""
+        mtime = os.path.getmtime(CACHE_ZIP)
+        try:
+            return max(mtime, os.path.getmtime(CACHE_INCR))
+        except OSError:
+            return mtime
 
     def _is_cache_fresh(self) -> bool:
-        """Cache fresh iff ZIP file is <24 h alt."""
+        """Cache fresh iff the last fetch is <24 h alt."""
         try:
-            mtime = os.path.getmtime(CACHE_ZIP)
-            return (datetime.now().timestamp() - mtime) < 24 * 3600
+            return (datetime.now().timestamp() - self._fetched_at()) < MAX_AGE
         except OSError:
             return False
 
+    def refresh(self, force: bool = False):
+        """
+        Update the cache if stale (or `force`: full download), load it and
+        swap the new table in. Blocks the caller; lookups keep using the
+        previous table meanwhile.
+        """
+        with instrumentation.timed("ecb.refresh"):
+            update = force or not self._is_cache_fresh()
+            # a fresh cache is only read: no cross-process lock needed
+            with self._exclusive(files=update) as writable:
+                if update and writable and (force or not self._is_cache_fresh()):
+                    table = None if force else self._update_incremental()
+                    if table is None:
+                        self._download_and_extract()
+                        table = self._load_rates()
+                elif self._is_published():
+                    table = None   # already serving the newest snapshot
+                else:
+                    table = self._load_rates()
+                if not writable:
+                    # read-only cache dir: serve what is cached, retry later
+                    expires_at = time.time() + RETRY_DELAY
+                else:
+                    try:
+                        expires_at = self._fetched_at() + MAX_AGE
+                    except OSError:
+                        expires_at = time.time() + RETRY_DELAY
+                if self.shared:
+                    expires_at = min(expires_at, time.time() + SHARED_POLL)
+        if table is not None:
+            self._set_rates(table)
+        self._expires_at = expires_at
+
+    @contextmanager
+    def _exclusive(self, files: bool = True):
+        """
+        Serialize cache updates across threads and, with `files`, processes.
+        Callers re-check freshness inside, so a process that waited reuses
+        the winner's download. Yields False if the lock file cannot be
+        created (read-only cache dir): then only the cached files are loaded.
+        """
+        with ECBBackend._lock:
+            if not files:
+                yield True
+                return
+            lock = FileLock(CACHE_LOCK)
+            try:
+                lock.acquire()
+            except OSError as e:
+                if e.errno not in (errno.EACCES, errno.EPERM, errno.EROFS):
+                    raise
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                lock.release()
+
+    def _is_published(self) -> bool:
+        """Shared mode: is the in-memory table the newest published snapshot?"""
+        table = getattr(self, "_table", None)
+        return (
+            self.shared and table is not None and table.generation > 0
+            and RateTable.read_generation(CACHE_SNAPSHOT) == table.generation
+        )
+
+    def _update_incremental(self) -> RateTable | None:
+        """
+        Append the days of the ECB 90-day feed that are newer than the cached
+        history to that history and to CACHE_INCR, and publish the result as
+        the snapshot. Returns the new table, or None if a full download is
+        needed (incremental mode off, no history yet, feed unreachable, or a
+        gap between the cached history and the feed). Runs under the cache
+        file lock.
+        """
+        if not self.incremental:
+            return None
+        current = getattr(self, "_table", None)
+        if (
+            current is None or not current.generation
+            or RateTable.read_generation(CACHE_SNAPSHOT) != current.generation
+        ):
+            # cut off at the history on disk, not at this process's table:
+            # another process may have appended days since it was loaded
+            if not (os.path.exists(CACHE_ZIP) and os.path.exists(CACHE_CSV)):
+                return None
+            current = self._load_rates()
+        if not len(current):
+            return None
+        try:
+            feed = parse_feed(_fetch_bytes(FEED_URL))
+        except Exception:
+            return None
+        if not len(feed) or feed.first > current.latest:
+            return None
+        new = RateTable.from_rows(
+            (feed.date_at(i), feed.row(i))
+            for i in feed.rows_between(date.fromordinal(current.latest.toordinal() + 1), feed.latest)
+        )
+        if not len(new) and os.path.exists(CACHE_INCR):
+            os.utime(CACHE_INCR)   # nothing new: only mark the fetch time
+        elif not new.append_csv(CACHE_INCR):
+            # first incremental day, or the feed brought a new currency column
+            if os.path.exists(CACHE_INCR):
+                new = RateTable.from_csv(CACHE_INCR).merge(new)
+            new.to_csv(CACHE_INCR)
+        table = current.merge(new)
+        self._save_snapshot(table, self._snapshot_key())
+        return table
+
+    def _start_refresh(self):
+        """Refresh in a daemon thread unless one is already running."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+
+        def _worker():
+            try:
+                self.refresh()
+            except Exception as e:
+                # keep serving the current table; try again later
+                if instrumentation.enabled:
+                    instrumentation.count("ecb.refresh_error", error=type(e).__name__)
+                self._expires_at = time.time() + RETRY_DELAY
+            finally:
+                self._refresh_lock.release()
+
+        threading.Thread(target=_worker, name="fxmoney-ecb-refresh", daemon=True).start()
+
     def _download_and_extract(self):
         """Fetch the ZIP and extract the CSV into memory."""
-        resp = requests.get(ZIP_URL, timeout=settings.request_timeout)
-        resp.raise_for_status()
-        with open(CACHE_ZIP, "wb") as f:
-            f.write(resp.content)
-        # unzip in place (we only need in-memory CSV parsing)
-        with zipfile.ZipFile(io.BytesIO(resp.content)) as z:
+        import zipfile
+
+        with instrumentation.timed("ecb.download"):
+            content = _fetch_bytes(ZIP_URL)
+        # unzip in memory first: a broken download never reaches the cache
+        with zipfile.ZipFile(io.BytesIO(content)) as z:
             name = next(n for n in z.namelist() if n.endswith(".csv"))
-            with z.open(name) as zf, open(os.path.join(CACHE_DIR, name), "wb") as out:
-                out.write(zf.read())
-
-    def _load_rates(self) -> dict[date, dict[str, Decimal]]:
-        """Parse the extracted CSV into date → {currency: rate}."""
-        csv_path = os.path.join(CACHE_DIR, "eurofxref-hist.csv")
-        rates: dict[date, dict[str, Decimal]] = {}
-        with open(csv_path, encoding="utf-8") as f:
-            reader = csv.reader(f)
-            headers   = next(reader)
-            currencies= headers[1:]
-            for row in reader:
-                try:
-                    d = datetime.strptime(row[0], DATE_FMT).date()
-                except Exception:
-                    continue
-                daily: dict[str, Decimal] = {}
-                for cur, val in zip(currencies, row[1:]):
-                    if not val:
-                        continue
-                    try:
-                        daily[cur] = Decimal(val)
-                    except InvalidOperation:
-                        continue
-                rates[d] = daily
-        return rates
+            csv_bytes = z.read(name)
+        # CSV before ZIP: the snapshot key follows the ZIP, so a crash in
+        # between leaves the previous snapshot consistent with its ZIP
+        _atomic_write(CACHE_CSV, csv_bytes)
+        _atomic_write(CACHE_ZIP, content)
+        # the full history supersedes any incrementally merged days
+        try:
+            os.remove(CACHE_INCR)
+        except FileNotFoundError:
+            pass
 
-    def get_rate(self, src: str, tgt: str, on_date: date | None = None) -> float:
+    def _snapshot_key(self) -> bytes | None:
         """
-        Get rate src→tgt on on_date, auto-refreshing the ZIP if stale.
+        Identify the cached ZIP by mtime, size and SHA-256 (None if absent),
+        plus the incremental side CSV if there is one.
         """
-        if not self._is_cache_fresh():
-            with ECBBackend._lock:
-                if not self._is_cache_fresh():
-                    self._download_and_extract()
-                    self._rates = self._load_rates()
+        try:
+            st = os.stat(CACHE_ZIP)
+            with open(CACHE_ZIP, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+        key = f"{st.st_mtime_ns}:{st.st_size}:{digest}"
+        try:
+            incr = os.stat(CACHE_INCR)
+            key += f"+{incr.st_mtime_ns}:{incr.st_size}"
+        except OSError:
+            pass
+        return key.encode("ascii")
 
-        # choose the effective date
-        if on_date is None:
-            on_date = max(self._rates.keys())
+    def _load_rates(self) -> RateTable:
+        """
+        Load the columnar date × currency table: map the binary snapshot if it
+        matches the cached files, else parse the extracted CSV (plus merged
+        incremental days) and write one.
+        """
+        start = time.perf_counter()
+        key = self._snapshot_key()
+        if key is not None:
+            table = RateTable.load(CACHE_SNAPSHOT, key)
+            if table is not None:
+                if instrumentation.enabled:
+                    instrumentation.observe("ecb.load_rates", time.perf_counter() - start, source="snapshot")
+                return table
+        table = RateTable.from_csv(CACHE_CSV)
+        if os.path.exists(CACHE_INCR):
+            table = table.merge(RateTable.from_csv(CACHE_INCR))
+        self._save_snapshot(table, key)
+        if instrumentation.enabled:
+            instrumentation.observe("ecb.load_rates", time.perf_counter() - start, source="csv")
+        return table
+
+    @staticmethod
+    def _save_snapshot(table: RateTable, key: bytes | None) -> None:
+        """Publish `table` as the next snapshot generation for the cached files."""
+        if key is None:
+            return
+        try:
+            generation = (RateTable.read_generation(CACHE_SNAPSHOT) or 0) + 1
+            table.save(CACHE_SNAPSHOT, key, generation)
+        except OSError:
+            pass  # read-only cache dir: keep parsing on startup
+
+    def _set_rates(self, table: RateTable):
+        """Install a parsed rate table (single reference swap)."""
+        refresh = getattr(self, "_table", None) is not None
+        self._table = table
+        self._cross = None
+        if refresh:
+            signals.notify("refresh", self)
+
+    def _cross_rates(self, table: RateTable) -> CrossRates | None:
+        """Cross-rate matrices for `table` under the current settings (None if disabled)."""
+        rows = settings.cross_rate_rows
+        if rows <= 0:
+            return None
+        cross = getattr(self, "_cross", None)
+        if (
+            cross is None or cross.table is not table
+            or cross.base != settings.base_currency or cross.max_rows != rows
+        ):
+            cross = self._cross = CrossRates(table, settings.base_currency, rows)
+        return cross
+
+    def precompute_cross_rates(self, days: int) -> None:
+        """Eagerly build the cross-rate matrices of the `days` most recent days."""
+        table = self._table
+        cross = self._cross_rates(table)
+        if cross is not None:
+            cross.precompute(range(len(table) - 1, max(len(table) - days, 0) - 1, -1))
 
-        available = [d for d in self._rates if d <= on_date]
-        if not available:
+    def seed_store(self, store, start: date | None = None, end: date | None = None) -> int:
+        """
+        Write the ECB history (base EUR) for days in [start, end] into a
+        RateStore in one bulk insert. Returns the number of rates written.
+        """
+        table = self._table
+        rows = (
+            (table.date_at(i), table.row(i))
+            for i in range(len(table))
+            if (start is None or table.date_at(i) >= start)
+            and (end is None or table.date_at(i) <= end)
+        )
+        return store.put_tables("EUR", rows)
+
+    @staticmethod
+    def _row_index(table: RateTable, on_date: date | None) -> int:
+        """Index of the last business day on or before on_date (latest if None)."""
+        if on_date is None:
+            return len(table) - 1
+        i = table.row_on_or_before(on_date)
+        if i < 0:
             if settings.fallback_mode == "last":
-                d0 = min(self._rates.keys())
-            else:
-                raise MissingRateError(f"No rates available on or before {on_date}")
-        else:
-            d0 = max(available)
+                if instrumentation.enabled:
+                    instrumentation.count("rate.fallback", source="ecb", reason="before_history")
+                return 0
+            raise MissingRateError(f"No rates available on or before {on_date}")
+        return i
+
+    def effective_date(self, on_date: date | None = None) -> date:
+        """Business day whose rates answer a request for on_date."""
+        table = self._table
+        return table.date_at(self._row_index(table, on_date))
+
+    @staticmethod
+    def _resolve_row(table: RateTable, src: str, tgt: str, i: int) -> int:
+        """
+        Walk back from row i to the last row quoting both src and tgt.
+        Equivalent to retrying the previous business day until both are found.
+        """
+        while True:
+            j = i
+            for cur in (src, tgt):
+                if cur == settings.base_currency:
+                    continue
+                col = table.column(cur)
+                last = -1 if col is None else table.last_valid_row(col, j)
+                if last == j:
+                    continue
+                if settings.fallback_mode != "last":
+                    raise MissingRateError(f"No rate for {cur} on {table.date_at(j)}")
+                if last < 0:
+                    raise MissingRateError(
+                        f"No rate for {cur} on or before {table.date_at(j)}"
+                    )
+                if instrumentation.enabled:
+                    instrumentation.count("rate.fallback", source="ecb", reason="previous_day")
+                j = last
+            if j == i:
+                return i
+            i = j
+
+    def get_rate(self, src: str, tgt: str, on_date: date | None = None) -> float:
+        """
+        Get rate src→tgt on on_date. A stale cache triggers a background
+        refresh; this call is answered from the current table.
+        """
+        return float(self.get_rate_decimal(src, tgt, on_date))
 
-        daily = self._rates[d0]
+    def get_rate_decimal(self, src: str, tgt: str, on_date: date | None = None) -> Decimal:
+        """Exact rate src→tgt as Decimal (no float round-trip); see get_rate()."""
+        if time.time() >= self._expires_at:
+            self._start_refresh()
+        table = self._table   # one consistent snapshot for the whole lookup
+
+        # choose the effective date
+        i = self._row_index(table, on_date)
         if src == tgt:
-            return 1.0
+            return Decimal(1)
+        i = self._resolve_row(table, src, tgt, i)
+
+        cross = self._cross_rates(table)
+        if cross is not None:
+            rate = cross.rate(i, src, tgt)
+            if rate is not None:
+                return rate
+        return self._row_rate(table, src, tgt, i)
 
+    @staticmethod
+    def _row_rate(table: RateTable, src: str, tgt: str, i: int) -> Decimal:
+        """src→tgt from row i, which must quote both (see _resolve_row)."""
         # src→EUR
         if src == settings.base_currency:
             src_to_eur = Decimal(1)
         else:
-            rate_src = daily.get(src)
-            if rate_src is None:
-                if settings.fallback_mode == "last":
-                    return self.get_rate(src, tgt, d0 - timedelta(days=1))
-                raise MissingRateError(f"No rate for {src} on {d0}")
-            src_to_eur = Decimal(1) / rate_src
+            src_to_eur = Decimal(1) / table.rate(i, table.column(src))
 
         # EUR→tgt
         if tgt == settings.base_currency:
             eur_to_tgt = Decimal(1)
         else:
-            rate_tgt = daily.get(tgt)
-            if rate_tgt is None:
-                if settings.fallback_mode == "last":
-                    return self.get_rate(src, tgt, d0 - timedelta(days=1))
-                raise MissingRateError(f"No rate for {tgt} on {d0}")
-            eur_to_tgt = rate_tgt
-
-        return float(src_to_eur * eur_to_tgt)
+            eur_to_tgt = table.rate(i, table.column(tgt))
+
+        return src_to_eur * eur_to_tgt
+
+    def get_series(
+        self, src: str, tgt: str, start: date, end: date, fill: str | None = "ffill"
+    ) -> Series:
+        """
+        Rates src→tgt for [start, end] as [(day, Decimal)] in one pass over
+        the table. fill="ffill" gives every day for which get_rate_decimal()
+        answers in "last" mode, with the same rate (days before the history
+        use the first day; in "raise" mode they are left out); fill=None only
+        the business days quoting both currencies.
+        """
+        check_fill(fill)
+        if time.time() >= self._expires_at:
+            self._start_refresh()
+        table = self._table
+        src, tgt = src.upper(), tgt.upper()
+        dates, n = table.dates, len(table)
+        last_valid = table.last_valid
+        offsets = []   # start of each needed column in last_valid
+        # src == tgt is 1 on every day, like get_rate_decimal(), even if unknown
+        needed = set() if src == tgt else {src, tgt} - {settings.base_currency}
+        for cur in needed:
+            col = table.column(cur)
+            if col is None:
+                raise MissingRateError(f"No rates for {cur}")
+            offsets.append(col * n)
+
+        def common_row(i: int) -> int:
+            # last row <= i quoting every column; -1 if none
+            while i >= 0:
+                j = min((last_valid[off + i] for off in offsets), default=i)
+                if j == i:
+                    return i
+                i = j
+            return -1
+
+        # same arithmetic as _row_rate(), with the columns resolved once
+        values, width = table.values, len(table.currencies)
+        src_col, tgt_col = (
+            None if cur == settings.base_currency else table.column(cur) for cur in (src, tgt)
+        )
+        one = Decimal(1)
+
+        def rate_at(i: int) -> Decimal:
+            if src == tgt:
+                return one
+            src_to_eur = one if src_col is None else one / Decimal(repr(values[i * width + src_col]))
+            eur_to_tgt = one if tgt_col is None else Decimal(repr(values[i * width + tgt_col]))
+            return src_to_eur * eur_to_tgt
+
+        if fill is None:
+            return [
+                (table.date_at(i), rate_at(i))
+                for i in table.rows_between(start, end)
+                if common_row(i) == i
+            ]
+
+        # ffill: every row's rate covers the days up to the next row
+        out: Series = []
+        fromordinal = date.fromordinal
+        day, stop = start.toordinal(), end.toordinal() + 1
+        i = table.row_on_or_before(start)
+        if i < 0 and n:
+            # before the history: row 0 in "last" mode (see _row_index), else omitted
+            if settings.fallback_mode != "last":
+                day = max(day, dates[0])
+            i = 0
+        rates: dict[int, Decimal] = {}
+        while 0 <= i < n and day < stop:
+            until = min(dates[i + 1], stop) if i + 1 < n else stop
+            row = common_row(i)
+            if row >= 0:
+                rate = rates.get(row)
+                if rate is None:
+                    rate = rates[row] = rate_at(row)
+                out += [(fromordinal(d), rate) for d in range(day, until)]
+            day, i = until, i + 1
+        return out
+
+    def get_table(
+        self, on_date: date | None = None, currencies: Iterable[str] | None = None
+    ) -> dict[str, Decimal]:
+        """
+        Rates from settings.base_currency to each of `currencies` (default:
+        every ECB currency) on on_date; currencies without a rate are left out.
+        """
+        if time.time() >= self._expires_at:
+            self._start_refresh()
+        table = self._table
+        i = self._row_index(table, on_date)
+        base = settings.base_currency
+        if currencies is None:
+            currencies = [cur for cur in table.currencies if cur != base]
+        out: dict[str, Decimal] = {}
+        for cur in currencies:
+            cur = cur.upper()
+            if cur == base:
+                out[cur] = Decimal(1)
+                continue
+            try:
+                out[cur] = self._row_rate(table, base, cur, self._resolve_row(table, base, cur, i))
+            except MissingRateError:
+                continue
+        return out
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write via a temp file + os.replace(), so readers see old or new, never partial."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _fetch_bytes(url: str) -> bytes:
+    """GET `url`; file:// URLs are read locally (fixtures, mirrors)."""
+    if url.startswith("file://"):
+        from urllib.parse import urlparse
+        from urllib.request import url2pathname
+
+        with open(url2pathname(urlparse(url).path), "rb") as f:
+            return f.read()
+    import requests
+
+    resp = requests.get(url, timeout=settings.request_timeout)
+    resp.raise_for_status()
+    return resp.content
+
+
+def parse_feed(xml_bytes: bytes) -> RateTable:
+    """Parse an ECB eurofxref XML feed (daily or 90-day) into a RateTable."""
+    root = ET.fromstring(xml_bytes)
+    rows = []
+    for cube in root.iter():
+        day = cube.get("time")
+        if day is None:
+            continue
+        rows.append((
+            date.fromisoformat(day),
+            {c.get("currency"): c.get("rate") for c in cube if c.get("currency")},
+        ))
+    return RateTable.from_rows(rows)
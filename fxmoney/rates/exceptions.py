@@ -8,3 +8,12 @@ class MissingRateError(Exception):
     and fallback_mode='raise' is set.
     """
     pass
+
+
+class RateProviderError(MissingRateError):
+    """
+    The rate source itself failed (network error, bad response, timeout), as
+    opposed to it having no rate for the request. CompositeBackend counts these
+    towards a provider's circuit breaker.
+    """
+    pass
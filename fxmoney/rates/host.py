@@ -1,43 +1,293 @@
 """
 ExchangeRateHost FX-Rate Backend for fxmoney
 Fetches live and historical rates via the exchangerate.host REST API.
+Whole base-currency rate tables are fetched per date (or per date range via
+the timeseries endpoint) and cross rates are triangulated locally, like
+ECBBackend does.
+Uses one pooled HTTP session, caches historical responses permanently and
+"latest" responses for `latest_ttl` seconds, and coalesces concurrent
+identical requests into a single HTTP call.
+HTTP failures and error bodies ({"success": false, "error": ...}) return 1.0
+in "last" mode; pass fallback="raise" (e.g. inside a CompositeBackend) to get
+a RateProviderError instead. Error bodies are never cached.
+With `store=` (a RateStore) past days are read from and written to the store,
+and its newest table is served when the API cannot be reached.
+get_series() answers a date range from the same single timeseries request.
 """
 
 from __future__ import annotations
-import requests
+import threading
+import time
+from concurrent.futures import Future
 from datetime import date
 from decimal import Decimal
+from typing import Any, Iterable, Optional
 
-from .exceptions import MissingRateError
+from .. import instrumentation
+from .exceptions import MissingRateError, RateProviderError
+from .series import Series, check_fill, days
 from ..config import settings
 
-API_URL = "https://api.exchangerate.host/convert"
+BASE_URL = "https://api.exchangerate.host"
+LATEST_TTL = 300.0   # seconds a "latest" response is reused
 
 
 class HostBackend:
     """Backend using exchangerate.host API for FX conversion."""
 
-    def get_rate(self, src: str, tgt: str, on_date: date | None = None) -> float:
-        params: dict[str, str] = {
-            "from": src.upper(),
-            "to": tgt.upper(),
-            "amount": "1",
-            "places": "6"
-        }
-        if on_date:
-            params["date"] = on_date.isoformat()
+    def __init__(
+        self,
+        session: Any = None,
+        latest_ttl: float = LATEST_TTL,
+        pool_size: int = 10,
+        base_url: str = BASE_URL,
+        access_key: Optional[str] = None,
+        fallback: Optional[str] = None,
+        store: Any = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.access_key = access_key
+        # "last"/"raise" overrides settings.fallback_mode for HTTP failures
+        self.fallback = fallback
+        # optional RateStore: read-through for past days, last resort when offline
+        self.store = store
+        self.latest_ttl = latest_ttl
+        self._session = session
+        self._pool_size = pool_size
+        self._responses: dict[tuple, tuple[Any, Optional[float]]] = {}
+        self._inflight: dict[tuple, Future] = {}
+        self._tables: dict[tuple[str, date], dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Shared keep-alive `requests.Session`, created on first use."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            with self._lock:
+                if self._session is None:
+                    s = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self._pool_size, pool_maxsize=self._pool_size)
+                    s.mount("https://", adapter)
+                    s.mount("http://", adapter)
+                    self._session = s
+        return self._session
+
+    def _fetch(self, url: str, params: dict[str, str], historical: bool, what: str) -> dict[str, Any]:
+        """
+        GET `url` and return the "rates" of the decoded JSON, served from the
+        response cache when possible. Error bodies raise RateProviderError
+        and are never cached. Concurrent callers of the same request share
+        one call.
+        """
+        key = (url, tuple(sorted(params.items())))
+        with self._lock:
+            hit = self._responses.get(key)
+            if hit is not None and (hit[1] is None or hit[1] > time.monotonic()):
+                return hit[0]
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._inflight[key] = Future()
+        if not owner:
+            return fut.result()
 
         try:
-            resp = requests.get(API_URL, params=params, timeout=settings.request_timeout)
-            resp.raise_for_status()
-            data = resp.json()
-            rate = data.get("info", {}).get("rate")
-            if rate is None:
-                raise MissingRateError(f"No rate for {src}->{tgt} on {on_date}")
-            return float(rate)
+            with instrumentation.timed("host.request", endpoint=url.rsplit("/", 1)[-1]):
+                resp = self.session.get(url, params=params, timeout=settings.request_timeout)
+                resp.raise_for_status()
+                data = self._rates_of(resp.json(), what)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            fut.set_exception(e)
+            raise
+        expires = None if historical else time.monotonic() + self.latest_ttl
+        with self._lock:
+            self._responses[key] = (data, expires)
+            del self._inflight[key]
+        fut.set_result(data)
+        return data
+
+    def clear_cache(self) -> None:
+        """Forget all cached responses and prefetched tables."""
+        with self._lock:
+            self._responses.clear()
+            self._tables.clear()
+
+    def _params(self, **params: str) -> dict[str, str]:
+        params["base"] = settings.base_currency
+        if self.access_key:
+            params["access_key"] = self.access_key
+        return params
+
+    @staticmethod
+    def _rates_of(data: Any, what: str) -> dict[str, Any]:
+        """The "rates" of an API response; error bodies (rate limit, bad key, ...) raise."""
+        if not isinstance(data, dict) or data.get("success") is False or not isinstance(data.get("rates"), dict):
+            error = data.get("error", data) if isinstance(data, dict) else data
+            raise RateProviderError(f"No rate table for {what}: {error!r}")
+        return data["rates"]
+
+    def _table(self, on_date: date | None) -> dict[str, Any]:
+        """Base-currency rate table {currency: rate} for on_date (latest if None)."""
+        import requests
+
+        base, store = settings.base_currency, self.store
+        if on_date is not None:
+            table = self._tables.get((base, on_date))
+            if table is not None:
+                return table
+        historical = on_date is not None and on_date < date.today()
+        if historical and store is not None:
+            table = store.get_table(base, on_date)
+            if table is not None:
+                return table
+        try:
+            if on_date is None:
+                table = self._fetch(f"{self.base_url}/latest", self._params(), False, "latest")
+            else:
+                table = self._fetch(
+                    f"{self.base_url}/{on_date.isoformat()}", self._params(), historical,
+                    on_date.isoformat(),
+                )
+        except (requests.RequestException, ValueError, RateProviderError):
+            # upstream unreachable: serve the newest stored table instead
+            found = store.table_on_or_before(base, on_date or date.today()) if store else None
+            if found is None:
+                raise
+            if instrumentation.enabled:
+                instrumentation.count("rate.fallback", source="host", reason="store")
+            return found[1]
+        if historical and store is not None:
+            store.put_tables(base, [(on_date, table)])
+        return table
+
+    def _timeseries(self, start: date, end: date) -> dict[date, dict[str, Any]]:
+        """Published tables for [start, end] from one timeseries request, by day."""
+        series = self._fetch(
+            f"{self.base_url}/timeseries",
+            self._params(start_date=start.isoformat(), end_date=end.isoformat()),
+            end < date.today(),
+            f"{start}..{end}",
+        )
+        by_day = {date.fromisoformat(day): rates for day, rates in series.items()}
+        if self.store is not None:
+            today = date.today()
+            self.store.put_tables(
+                settings.base_currency, ((d, t) for d, t in by_day.items() if d < today)
+            )
+        return by_day
+
+    def prefetch(self, start: date, end: date) -> int:
+        """
+        Load the rate tables for every day in [start, end] with one timeseries
+        request. Days without a table (weekends, holidays) reuse the previous
+        day's. Returns the number of days now available locally.
+        """
+        by_day = self._timeseries(start, end)
+        base, filled, last = settings.base_currency, 0, None
+        with self._lock:
+            for day in days(start, end):
+                last = by_day.get(day, last)
+                if last is not None:
+                    self._tables[(base, day)] = last
+                    filled += 1
+        return filled
+
+    @staticmethod
+    def _cross(table: dict[str, Any], src: str, tgt: str, what: Any) -> Decimal:
+        """src→tgt triangulated via the base currency of `table`."""
+        base = settings.base_currency
+        rates = [Decimal(1) if cur == base else table.get(cur) for cur in (src, tgt)]
+        if rates[0] is None or rates[1] is None:
+            raise MissingRateError(f"No rate for {src}->{tgt} on {what}")
+        src_rate, tgt_rate = (r if isinstance(r, Decimal) else Decimal(str(r)) for r in rates)
+        return tgt_rate / src_rate
 
+    def get_series(
+        self, src: str, tgt: str, start: date, end: date, fill: Optional[str] = "ffill"
+    ) -> Series:
+        """
+        Rates src→tgt for [start, end] as [(day, Decimal)] from one timeseries
+        request; fill="ffill" returns every calendar day (a weekend `start`
+        is seeded from the previous business day), fill=None only the
+        published days quoting both currencies. HTTP failures raise
+        RateProviderError regardless of the fallback mode.
+        """
+        import requests
+
+        check_fill(fill)
+        src, tgt = src.upper(), tgt.upper()
+        try:
+            by_day = self._timeseries(start, end)
+            if fill == "ffill" and start not in by_day:
+                try:
+                    by_day[start] = self._table(start)
+                except MissingRateError:
+                    pass
+        except (requests.RequestException, ValueError) as e:
+            raise RateProviderError(f"Error fetching rates for {start}..{end}: {e}") from e
+        out: Series = []
+        last: Optional[Decimal] = None
+        for day in days(start, end):
+            table, fresh = by_day.get(day), None
+            if table is not None:
+                try:
+                    fresh = Decimal(1) if src == tgt else self._cross(table, src, tgt, day)
+                except MissingRateError:
+                    pass
+            if fresh is not None:
+                last = fresh
+            rate = last if fill == "ffill" else fresh
+            if rate is not None:
+                out.append((day, rate))
+        return out
+
+    def get_table(
+        self, on_date: date | None = None, currencies: Optional[Iterable[str]] = None
+    ) -> dict[str, Decimal]:
+        """
+        Rates from settings.base_currency to each of `currencies` (default:
+        all in the API's table) on on_date; currencies without a rate are left out.
+        """
+        import requests
+
+        try:
+            table = self._table(on_date)
         except (requests.RequestException, ValueError) as e:
-            # On failure, either fallback or raise MissingRateError
-            if settings.fallback_mode == "last":
-                return 1.0
-            raise MissingRateError(f"Error fetching rate for {src}->{tgt} on {on_date}: {e}") from e
+            raise RateProviderError(f"Error fetching rates for {on_date}: {e}") from e
+        base = settings.base_currency
+        if currencies is None:
+            currencies = [cur for cur in table if cur != base]
+        out: dict[str, Decimal] = {}
+        for cur in currencies:
+            cur = cur.upper()
+            try:
+                out[cur] = Decimal(1) if cur == base else self._cross(table, base, cur, on_date)
+            except MissingRateError:
+                continue
+        return out
+
+    def get_rate(self, src: str, tgt: str, on_date: date | None = None) -> float:
+        return float(self.get_rate_decimal(src, tgt, on_date))
+
+    def get_rate_decimal(self, src: str, tgt: str, on_date: date | None = None) -> Decimal:
+        """Rate src→tgt as Decimal, triangulated exactly from the JSON quotes."""
+        import requests
+
+        src, tgt = src.upper(), tgt.upper()
+        if src == tgt:
+            return Decimal(1)
+        try:
+            return self._cross(self._table(on_date), src, tgt, on_date)
+
+        except (requests.RequestException, ValueError, RateProviderError) as e:
+            # On failure, either fallback or raise RateProviderError
+            if (self.fallback or settings.fallback_mode) == "last":
+                if instrumentation.enabled:
+                    instrumentation.count("rate.fallback", source="host", reason=type(e).__name__)
+                return Decimal(1)
+            raise RateProviderError(f"Error fetching rate for {src}->{tgt} on {on_date}: {e}") from e
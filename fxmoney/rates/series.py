@@ -0,0 +1,89 @@
+"""
+Date-range and table queries for fxmoney backends.
+- get_series(src, tgt, start, end, fill)  [(day, rate)] ascending, Decimal rates
+- get_table(on_date, currencies)          {currency: rate} from the base currency
+ECBBackend and HostBackend answer both natively (one pass over the table, one
+timeseries request); series_by_lookup()/table_by_lookup() serve any other
+backend with one rate lookup per day or currency.
+
+Fill modes:
+- "ffill"  every calendar day in [start, end] the backend can answer; days
+           without a fresh quote carry the last one forward
+- None     only the days on which both currencies were quoted
+"""
+
+from __future__ import annotations
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Iterable, Optional
+
+from .exceptions import MissingRateError
+from ..config import settings
+
+FILL_MODES = ("ffill", None)
+
+Series = list[tuple[date, Decimal]]
+
+
+def check_fill(fill: Optional[str]) -> None:
+    if fill not in FILL_MODES:
+        raise ValueError(f"fill must be 'ffill' or None, not {fill!r}")
+
+
+def days(start: date, end: date) -> Iterable[date]:
+    """Every calendar day in [start, end]."""
+    for n in range((end - start).days + 1):
+        yield start + timedelta(days=n)
+
+
+def series_by_lookup(
+    getter: Callable[..., Decimal],
+    src: str,
+    tgt: str,
+    start: date,
+    end: date,
+    fill: Optional[str] = "ffill",
+    effective_date: Optional[Callable[[date], date]] = None,
+) -> Series:
+    """
+    Generic get_series(): one getter(src, tgt, day) call per calendar day.
+    With fill=None, `effective_date` (if the backend has one) drops the days
+    that were answered from an earlier day; without it every answered day is kept.
+    """
+    check_fill(fill)
+    out: Series = []
+    last: Optional[Decimal] = None
+    for day in days(start, end):
+        if fill is None and effective_date is not None:
+            try:
+                if effective_date(day) != day:
+                    continue
+            except MissingRateError:
+                continue
+        try:
+            last = getter(src, tgt, day)
+        except MissingRateError:
+            if fill is None or last is None:
+                continue
+        out.append((day, last))
+    return out
+
+
+def table_by_lookup(
+    getter: Callable[..., Decimal],
+    on_date: Optional[date],
+    currencies: Optional[Iterable[str]],
+) -> dict[str, Decimal]:
+    """Generic get_table(): one base→currency lookup per currency; missing ones are left out."""
+    if currencies is None:
+        raise ValueError("currencies are required for backends without get_table()")
+    base = settings.base_currency
+    out: dict[str, Decimal] = {}
+    for cur in currencies:
+        cur = cur.upper()
+        try:
+            out[cur] = getter(base, cur, on_date)
+        except MissingRateError:
+            continue
+    return out
+
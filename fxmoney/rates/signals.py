@@ -0,0 +1,50 @@
+"""
+fxmoney – FX-Rate change notifications
+Listeners are told when previously returned rates may be outdated:
+- "install": install_backend() switched the active backend
+- "refresh": a backend reloaded its data (e.g. ECB cache refresh)
+"""
+
+import threading
+import weakref
+from typing import Any, Callable
+
+Listener = Callable[[str, Any], None]
+
+_listeners: list = []
+_lock = threading.Lock()
+
+
+def _ref(callback: Listener):
+    # bound methods are held weakly so subscribers can be garbage collected
+    if hasattr(callback, "__self__"):
+        return weakref.WeakMethod(callback)
+    return lambda: callback
+
+
+def subscribe(callback: Listener) -> None:
+    """Call `callback(event, source)` on every rate change notification."""
+    with _lock:
+        _listeners.append(_ref(callback))
+
+
+def unsubscribe(callback: Listener) -> None:
+    """Remove a callback registered with subscribe()."""
+    with _lock:
+        _listeners[:] = [r for r in _listeners if r() not in (None, callback)]
+
+
+def notify(event: str, source: Any) -> None:
+    """Tell all live listeners that `source` triggered `event`."""
+    with _lock:
+        refs = list(_listeners)
+    dead = False
+    for ref in refs:
+        callback = ref()
+        if callback is None:
+            dead = True
+            continue
+        callback(event, source)
+    if dead:
+        with _lock:
+            _listeners[:] = [r for r in _listeners if r() is not None]
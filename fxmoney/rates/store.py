@@ -0,0 +1,139 @@
+"""
+Persistent FX-rate stores for fxmoney.
+A RateStore keeps whole base-currency rate tables per day, so backends can
+write what they fetched and read it back after a restart or from another
+process on the same host:
+- RateStore        protocol (bulk put, per-day and on-or-before reads, ranges)
+- SQLiteRateStore  local SQLite file, WAL mode, indexed by (base, currency, day);
+                   rates are stored as text so Decimals round-trip exactly
+- StoreBackend     RateBackend answering from a store alone (offline tier)
+
+HostBackend(store=...) reads through a store; ECBBackend.seed_store() fills
+one from the ECB history (base EUR).
+"""
+
+from __future__ import annotations
+import os
+import sqlite3
+import threading
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Mapping, Optional, Protocol, runtime_checkable
+
+from .exceptions import MissingRateError
+from ..config import settings
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".fxmoney", "rates.sqlite3")
+
+Table = dict[str, Decimal]
+
+
+@runtime_checkable
+class RateStore(Protocol):
+    def put_tables(self, base: str, tables: Iterable[tuple[date, Mapping[str, object]]]) -> int: ...
+
+    def get_table(self, base: str, on_date: date) -> Optional[Table]: ...
+
+    def table_on_or_before(self, base: str, on_date: date) -> Optional[tuple[date, Table]]: ...
+
+    def series(
+        self, base: str, currency: str, start: date, end: date
+    ) -> list[tuple[date, Decimal]]: ...
+
+
+class SQLiteRateStore:
+    """RateStore in a local SQLite database, safe across threads and processes."""
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS rates ("
+        " base TEXT NOT NULL, currency TEXT NOT NULL, day TEXT NOT NULL, rate TEXT NOT NULL,"
+        " PRIMARY KEY (base, currency, day)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS rates_by_day ON rates (base, day)",
+    )
+
+    def __init__(self, path: str = DEFAULT_PATH, timeout: float = 30.0):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                # readers never block the writer of another process
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            for stmt in self._SCHEMA:
+                self._conn.execute(stmt)
+
+    def put_tables(self, base: str, tables: Iterable[tuple[date, Mapping[str, object]]]) -> int:
+        """Insert or replace whole day tables in one transaction; returns rows written."""
+        base = base.upper()
+        rows = [
+            (base, cur.upper(), day.isoformat(), str(rate))
+            for day, quotes in tables
+            for cur, rate in quotes.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rates (base, currency, day, rate) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def get_table(self, base: str, on_date: date) -> Optional[Table]:
+        """The table stored for exactly on_date (None if there is none)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT currency, rate FROM rates WHERE base = ? AND day = ?",
+                (base.upper(), on_date.isoformat()),
+            ).fetchall()
+        return {cur: Decimal(rate) for cur, rate in rows} or None
+
+    def table_on_or_before(self, base: str, on_date: date) -> Optional[tuple[date, Table]]:
+        """The newest table stored on or before on_date, with its date."""
+        with self._lock:
+            (day,) = self._conn.execute(
+                "SELECT MAX(day) FROM rates WHERE base = ? AND day <= ?",
+                (base.upper(), on_date.isoformat()),
+            ).fetchone()
+        if day is None:
+            return None
+        day = date.fromisoformat(day)
+        return day, self.get_table(base, day)
+
+    def series(self, base: str, currency: str, start: date, end: date) -> list[tuple[date, Decimal]]:
+        """Stored rates of one currency for days in [start, end], ascending."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, rate FROM rates WHERE base = ? AND currency = ? AND day BETWEEN ? AND ?"
+                " ORDER BY day",
+                (base.upper(), currency.upper(), start.isoformat(), end.isoformat()),
+            ).fetchall()
+        return [(date.fromisoformat(day), Decimal(rate)) for day, rate in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class StoreBackend:
+    """RateBackend served only from a RateStore (the last table on or before the date)."""
+
+    def __init__(self, store: RateStore):
+        self.store = store
+
+    def get_rate(self, src: str, tgt: str, on_date: date | None = None) -> float:
+        return float(self.get_rate_decimal(src, tgt, on_date))
+
+    def get_rate_decimal(self, src: str, tgt: str, on_date: date | None = None) -> Decimal:
+        src, tgt = src.upper(), tgt.upper()
+        if src == tgt:
+            return Decimal(1)
+        base = settings.base_currency
+        found = self.store.table_on_or_before(base, on_date or date.today())
+        if found is None:
+            raise MissingRateError(f"No stored rates for base {base} on or before {on_date}")
+        day, table = found
+        rates = [Decimal(1) if cur == base else table.get(cur) for cur in (src, tgt)]
+        if rates[0] is None or rates[1] is None:
+            raise MissingRateError(f"No stored rate for {src}->{tgt} on {day}")
+        return rates[1] / rates[0]
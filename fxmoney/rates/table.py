@@ -0,0 +1,441 @@
+"""
+Columnar FX-rate store for fxmoney.
+
+One ordinal-date axis, one currency axis and a dense row-major float64
+matrix (NaN = no quote), backed by `array` so no per-cell objects are
+allocated. NumPy is optional and only used by `as_numpy()`.
+
+Tables can be saved as a binary snapshot and loaded back memory-mapped,
+read-only, so processes on one host share the same pages. Each snapshot
+carries a generation number so readers can tell when a newer one was
+published.
+
+CrossRates keeps lazily built per-row cross-rate matrices over a table so
+hot dates answer any pair with one index lookup.
+"""
+
+from __future__ import annotations
+import csv
+import io
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Mapping, Optional
+
+NAN = float("nan")
+
+# snapshot layout (native byte order, sections 8-byte aligned):
+#   header | key | currencies (comma-joined) | dates i32 | values f64 | last_valid i32
+SNAPSHOT_MAGIC   = b"FXRT"
+SNAPSHOT_VERSION = 2
+# magic, version, byteorder, n, width, key len, cur len, generation
+_HEADER = struct.Struct("=4sHcxIIIIQ")
+
+
+def _pad(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _raw(buf) -> memoryview:
+    """Bytes of an array or typed memoryview, for array.frombytes()."""
+    return memoryview(buf).cast("B")
+
+
+class RateTable:
+    """Immutable base-currency rate history: date × currency → rate."""
+
+    __slots__ = ("dates", "currencies", "values", "last_valid", "generation", "_columns")
+
+    def __init__(
+        self,
+        dates: array,
+        currencies: tuple[str, ...],
+        values: array,
+        last_valid: Optional[array] = None,
+        generation: int = 0,
+    ):
+        self.generation = generation      # snapshot generation (0: never saved)
+        self.dates = dates                # strictly ascending date ordinals ('i')
+        self.currencies = currencies      # column order of `values`
+        self.values = values              # len(dates) × len(currencies) ('d')
+        self._columns = {cur: j for j, cur in enumerate(currencies)}
+        if last_valid is None:
+            last_valid = self._build_last_valid()
+        # per currency (column-major): index of the last row <= i quoting it
+        self.last_valid = last_valid
+
+    # ----- construction -----------------------------------------------------
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[date, Mapping[str, object]]]) -> RateTable:
+        """Build from (date, {currency: rate}) pairs in any order; a repeated date keeps its last row."""
+        rows = sorted(dict(rows).items(), key=lambda r: r[0])
+        currencies: dict[str, int] = {}
+        for _, daily in rows:
+            for cur in daily:
+                currencies.setdefault(cur, len(currencies))
+        width = len(currencies)
+        values = array("d", [NAN]) * (len(rows) * width)
+        for i, (_, daily) in enumerate(rows):
+            base = i * width
+            for cur, val in daily.items():
+                values[base + currencies[cur]] = float(val)
+        dates = array("i", (d.toordinal() for d, _ in rows))
+        return cls(dates, tuple(currencies), values)
+
+    @classmethod
+    def from_csv(cls, path: str) -> RateTable:
+        """Parse an ECB `eurofxref-hist.csv` (newest day first, 'N/A' = no quote)."""
+        ordinals: list[int] = []
+        cells: list[float] = []
+        with open(path, encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            headers = next(reader)
+            currencies = tuple(h.strip() for h in headers[1:] if h.strip())
+            width = len(currencies)
+            for row in reader:
+                try:
+                    ordinals.append(date.fromisoformat(row[0].strip()).toordinal())
+                except (ValueError, IndexError):
+                    continue
+                for val in row[1:width + 1]:
+                    try:
+                        cells.append(float(val))
+                    except ValueError:
+                        cells.append(NAN)
+                cells.extend([NAN] * (width - (len(row) - 1)))
+        # the ECB file is newest-first (rows appended by append_csv() are
+        # oldest-first after those); the table is ascending, one row per day,
+        # and a repeated day keeps the row written last
+        last = {d: i for i, d in enumerate(ordinals)}
+        order = [last[d] for d in sorted(last)]
+        dates = array("i", sorted(last))
+        values = array("d")
+        for i in order:
+            values.extend(cells[i * width:(i + 1) * width])
+        return cls(dates, currencies, values)
+
+    def merge(self, other: RateTable) -> RateTable:
+        """
+        New table with the rows of both; `other` wins on duplicate dates.
+        Works on the float columns directly; rows of `other` that all follow
+        this table (new days from a feed) are appended without re-sorting.
+        """
+        if not len(other):
+            return self
+        currencies = self.currencies + tuple(c for c in other.currencies if c not in self._columns)
+        if len(self) and other.dates[0] > self.dates[-1] and currencies == self.currencies:
+            # frombytes: plain copies, also from memory-mapped snapshots
+            dates = array("i")
+            dates.frombytes(_raw(self.dates))
+            dates.frombytes(_raw(other.dates))
+            values = array("d")
+            values.frombytes(_raw(self.values))
+            for i in range(len(other)):
+                values.extend(other._row_values(i, currencies))
+            return RateTable(dates, currencies, values, self._append_last_valid(other, values))
+
+        # overlapping dates or new currencies: rebuild row by row
+        rows = {d: (self, i) for i, d in enumerate(self.dates)}
+        rows.update((d, (other, i)) for i, d in enumerate(other.dates))
+        dates = array("i", sorted(rows))
+        values = array("d")
+        for d in dates:
+            table, i = rows[d]
+            values.extend(table._row_values(i, currencies))
+        return RateTable(dates, currencies, values)
+
+    def _row_values(self, i: int, currencies: tuple[str, ...]) -> array:
+        """Row i as floats in the column order `currencies` (NaN where absent)."""
+        width = len(self.currencies)
+        if currencies == self.currencies:
+            return self.values[i * width:(i + 1) * width]
+        cols = [self._columns.get(cur) for cur in currencies]
+        return array("d", (NAN if j is None else self.values[i * width + j] for j in cols))
+
+    def _append_last_valid(self, other: RateTable, values: array) -> array:
+        """last_valid of this table followed by the rows of `other` (same columns)."""
+        n, width, total = len(self), len(self.currencies), len(self) + len(other)
+        last_valid = array("i")
+        for j in range(width):
+            last_valid.frombytes(_raw(self.last_valid[j * n:(j + 1) * n]))
+            prev = self.last_valid[(j + 1) * n - 1] if n else -1
+            for i in range(n, total):
+                if not math.isnan(values[i * width + j]):
+                    prev = i
+                last_valid.append(prev)
+        return last_valid
+
+    def to_csv(self, path: str) -> None:
+        """Write in the ECB CSV layout (newest day first, 'N/A' = no quote)."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Date", *self.currencies, ""])
+            for i in range(len(self) - 1, -1, -1):
+                quotes = self.row(i)
+                writer.writerow([
+                    self.date_at(i).isoformat(),
+                    *(quotes.get(cur, "N/A") for cur in self.currencies),
+                    "",
+                ])
+        os.replace(tmp, path)
+
+    def append_csv(self, path: str) -> bool:
+        """
+        Append the rows (oldest first) to a CSV written by to_csv(), in that
+        file's column order. Returns False, writing nothing, if the file is
+        missing or lacks one of this table's currencies. The file is copied
+        to a temp file and renamed, so readers never see a partial row.
+        """
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return False
+        header = next(csv.reader([data.split(b"\n", 1)[0].decode("utf-8")]), [])
+        columns = [h.strip() for h in header[1:] if h.strip()]
+        if not header or not set(self.currencies) <= set(columns):
+            return False
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for i in range(len(self)):
+            quotes = self.row(i)
+            writer.writerow([
+                self.date_at(i).isoformat(), *(quotes.get(cur, "N/A") for cur in columns), ""
+            ])
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.write(buf.getvalue().encode("utf-8"))
+        os.replace(tmp, path)
+        return True
+
+    def _build_last_valid(self) -> array:
+        width = len(self.currencies)
+        last_valid = array("i")
+        for j in range(width):
+            prev, col = -1, []
+            for i, val in enumerate(self.values[j::width]):
+                if not math.isnan(val):
+                    prev = i
+                col.append(prev)
+            last_valid.extend(col)
+        return last_valid
+
+    # ----- binary snapshot --------------------------------------------------
+    def save(self, path: str, key: bytes, generation: int = 0) -> None:
+        """
+        Write a binary snapshot tagged with `key` (identifies the source data)
+        and `generation`. Written to a temp file and renamed, so mapped
+        readers never see a partial file.
+        """
+        cur = ",".join(self.currencies).encode("ascii")
+        header = _HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, sys.byteorder[0].encode(),
+            len(self.dates), len(self.currencies), len(key), len(cur), generation,
+        )
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            for chunk in (header, key, cur):
+                f.write(chunk)
+                f.write(b"\0" * (_pad(len(chunk)) - len(chunk)))
+            for arr in (self.dates, self.values, self.last_valid):
+                data = memoryview(arr).cast("B")
+                f.write(data)
+                f.write(b"\0" * (_pad(len(data)) - len(data)))
+        os.replace(tmp, path)
+        self.generation = generation
+
+    @staticmethod
+    def read_generation(path: str) -> Optional[int]:
+        """Generation of the snapshot at `path` (None if missing or foreign)."""
+        try:
+            with open(path, "rb") as f:
+                header = f.read(_HEADER.size)
+            magic, version, order, *_, generation = _HEADER.unpack(header)
+        except (OSError, struct.error):
+            return None
+        if (magic, version, order) != (SNAPSHOT_MAGIC, SNAPSHOT_VERSION, sys.byteorder[0].encode()):
+            return None
+        return generation
+
+    @classmethod
+    def load(cls, path: str, key: bytes) -> Optional[RateTable]:
+        """
+        Map a snapshot written by `save()` read-only.
+        Returns None if it is missing, foreign or was written for another `key`.
+        """
+        try:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        buf = memoryview(mm)
+        try:
+            magic, version, order, n, width, key_len, cur_len, generation = _HEADER.unpack_from(buf)
+        except struct.error:
+            return None
+        if (magic, version, order) != (SNAPSHOT_MAGIC, SNAPSHOT_VERSION, sys.byteorder[0].encode()):
+            return None
+        off = _pad(_HEADER.size)
+        if bytes(buf[off:off + key_len]) != key:
+            return None
+        off += _pad(key_len)
+        currencies = tuple(bytes(buf[off:off + cur_len]).decode("ascii").split(",")) if cur_len else ()
+        off += _pad(cur_len)
+        sections = []
+        for fmt, count in (("i", n), ("d", n * width), ("i", n * width)):
+            size = count * struct.calcsize(fmt)
+            if off + size > len(buf):
+                return None
+            sections.append(buf[off:off + size].cast(fmt))
+            off += _pad(size)
+        dates, values, last_valid = sections
+        return cls(dates, currencies, values, last_valid, generation)
+
+    # ----- lookups ----------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def date_at(self, i: int) -> date:
+        return date.fromordinal(self.dates[i])
+
+    @property
+    def first(self) -> Optional[date]:
+        return self.date_at(0) if len(self.dates) else None
+
+    @property
+    def latest(self) -> Optional[date]:
+        return self.date_at(-1) if len(self.dates) else None
+
+    def row_on_or_before(self, on_date: date) -> int:
+        """Index of the last row on or before `on_date`; -1 if none."""
+        return bisect_right(self.dates, on_date.toordinal()) - 1
+
+    def rows_between(self, start: date, end: date) -> range:
+        """Indices of the rows dated within [start, end]."""
+        return range(
+            bisect_left(self.dates, start.toordinal()), bisect_right(self.dates, end.toordinal())
+        )
+
+    def column(self, currency: str) -> Optional[int]:
+        return self._columns.get(currency)
+
+    def last_valid_row(self, col: int, i: int) -> int:
+        """Index of the last row <= i with a quote in column `col`; -1 if none."""
+        return self.last_valid[col * len(self.dates) + i]
+
+    def rate(self, i: int, col: int) -> Decimal:
+        """Rate at row i / column col as Decimal (exact for ECB's decimal quotes)."""
+        return Decimal(repr(self.values[i * len(self.currencies) + col]))
+
+    def row(self, i: int) -> dict[str, Decimal]:
+        """All quotes of row i as {currency: rate}."""
+        return {
+            cur: self.rate(i, j)
+            for j, cur in enumerate(self.currencies)
+            if self.last_valid[j * len(self.dates) + i] == i
+        }
+
+    def as_numpy(self):
+        """
+        Zero-copy NumPy views `(dates, values)`: int32 ordinals and a
+        len(dates) × len(currencies) float64 matrix. Requires NumPy.
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("RateTable.as_numpy() requires numpy") from e
+        dates = np.frombuffer(self.dates, dtype=np.int32)
+        values = np.frombuffer(self.values, dtype=np.float64)
+        return dates, values.reshape(len(self.dates), len(self.currencies))
+
+
+class CrossRates:
+    """
+    Per-row src→tgt rate matrices over a RateTable, triangulated via `base`.
+    A row's matrix is built the second time it is asked for, so one-off
+    historical lookups don't pay for it; at most `max_rows` matrices are kept
+    (LRU). Each holds (n+1)² Decimals, roughly 180 KB for 41 currencies.
+    """
+
+    def __init__(self, table: RateTable, base: str, max_rows: int):
+        self.table = table
+        self.base = base
+        self.max_rows = max_rows
+        codes = list(table.currencies)
+        if base not in table._columns:
+            codes.append(base)
+        self._index = {cur: k for k, cur in enumerate(codes)}
+        self._codes = codes
+        self._rows: OrderedDict[int, list] = OrderedDict()
+        self._seen: dict[int, None] = {}   # rows asked for once, oldest first
+        self._lock = threading.Lock()
+
+    def _build(self, i: int) -> list:
+        table, n = self.table, len(self._codes)
+        quotes: list[Optional[Decimal]] = []
+        for cur in self._codes:
+            if cur == self.base:
+                quotes.append(Decimal(1))
+            else:
+                j = table._columns[cur]
+                quotes.append(table.rate(i, j) if table.last_valid_row(j, i) == i else None)
+        inverse = [None if q is None else Decimal(1) / q for q in quotes]
+        matrix: list[Optional[Decimal]] = [None] * (n * n)
+        for a, inv in enumerate(inverse):
+            if inv is None:
+                continue
+            for b, q in enumerate(quotes):
+                if q is not None:
+                    matrix[a * n + b] = inv * q
+        return matrix
+
+    def matrix(self, i: int, build: bool = True) -> Optional[list]:
+        """
+        Flattened n×n matrix of row i. With build=False it is only built once
+        row i was asked for before; otherwise None is returned.
+        """
+        with self._lock:
+            m = self._rows.get(i)
+            if m is not None:
+                self._rows.move_to_end(i)
+                return m
+            if not build:
+                seen = self._seen
+                if i not in seen:
+                    seen[i] = None
+                    if len(seen) > self.max_rows:
+                        del seen[next(iter(seen))]
+                    return None
+                del seen[i]
+        m = self._build(i)
+        with self._lock:
+            self._rows[i] = m
+            while len(self._rows) > self.max_rows:
+                self._rows.popitem(last=False)
+        return m
+
+    def precompute(self, rows: Iterable[int]) -> None:
+        """Build the matrices for `rows` now (e.g. the most recent days)."""
+        for i in rows:
+            self.matrix(i)
+
+    def rate(self, i: int, src: str, tgt: str) -> Optional[Decimal]:
+        """
+        Cross rate src→tgt on row i; None if either side is not quoted or the
+        row is not hot yet (compute it directly then).
+        """
+        a, b = self._index.get(src), self._index.get(tgt)
+        if a is None or b is None:
+            return None
+        m = self.matrix(i, build=False)
+        return None if m is None else m[a * len(self._codes) + b]
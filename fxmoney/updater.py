@@ -13,6 +13,7 @@ import asyncio
 import time
 from typing import Optional
 
+from . import instrumentation
 from .rates.ecb import ECBBackend
 
 # ─── Thread-based updater ──────────────────────────────────────────────────
@@ -39,9 +40,9 @@ def enable_background_update(interval_hours: float = 4.0) -> None:
         while not _stop_event.wait(interval_hours * 3600):
             try:
                 ECBBackend()  # constructor forces cache refresh if stale
-            except Exception:
-                # ignore errors in background
-                pass
+            except Exception as e:
+                # keep running; failures are only visible via instrumentation
+                instrumentation.count("updater.error", error=type(e).__name__)
 
     t = threading.Thread(
         target=_worker,
@@ -76,9 +77,10 @@ async def async_background_update(
     evt = stop_event or asyncio.Event()
     while not evt.is_set():
         try:
-            ECBBackend()
-        except Exception:
-            pass
+            # download + parse must not block the event loop
+            await asyncio.to_thread(ECBBackend)
+        except Exception as e:
+            instrumentation.count("updater.error", error=type(e).__name__)
         # wait for either the event or the timeout
         try:
             await asyncio.wait_for(evt.wait(), timeout=interval_seconds)
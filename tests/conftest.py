@@ -0,0 +1,45 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+import fxmoney.rates.ecb as ecb_module
+
+ECB_CSV = (
+    "Date,USD,JPY,GBP,\n"
+    "2020-01-06,1.1194,121.48,0.85098,\n"
+    "2020-01-03,1.1147,121.20,N/A,\n"
+    "2020-01-02,1.1193,121.75,0.84828,\n"
+)
+
+
+def write_ecb_zip(path, csv_text=ECB_CSV):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("eurofxref-hist.csv", csv_text)
+    with open(path, "wb") as f:
+        f.write(buf.getvalue())
+
+
+@pytest.fixture
+def ecb_cache(tmp_path, monkeypatch):
+    """
+    Point the ECB backend at a fresh cache directory holding a small fixture
+    ZIP + extracted CSV, so no network access is needed.
+    """
+    monkeypatch.setattr(ecb_module, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(ecb_module, "CACHE_ZIP", os.path.join(tmp_path, "eurofxref-hist.zip"))
+    monkeypatch.setattr(ecb_module, "CACHE_CSV", os.path.join(tmp_path, "eurofxref-hist.csv"))
+    monkeypatch.setattr(ecb_module, "CACHE_SNAPSHOT", os.path.join(tmp_path, "eurofxref-hist.fxrt"))
+    monkeypatch.setattr(ecb_module, "CACHE_INCR", os.path.join(tmp_path, "eurofxref-incr.csv"))
+    monkeypatch.setattr(ecb_module, "CACHE_LOCK", os.path.join(tmp_path, "eurofxref.lock"))
+    # remote feeds point at (initially missing) local fixture files
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    monkeypatch.setattr(ecb_module, "ZIP_URL", (remote / "eurofxref-hist.zip").as_uri())
+    monkeypatch.setattr(ecb_module, "FEED_URL", (remote / "eurofxref-hist-90d.xml").as_uri())
+    write_ecb_zip(ecb_module.CACHE_ZIP)
+    with open(ecb_module.CACHE_CSV, "w") as f:
+        f.write(ECB_CSV)
+    return tmp_path
@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+import pytest
+
+import fxmoney.rates as rates
+from fxmoney import Money
+from fxmoney.rates import AsyncRateBackend, aconvert_amount, install_async_backend
+from fxmoney.rates.aio import AsyncECBBackend
+from fxmoney.rates.exceptions import MissingRateError
+
+
+class AsyncDummy:
+    async def get_rate(self, src, tgt, on_date=None):
+        if src == "XXX":
+            raise MissingRateError("no XXX")
+        return 2.0
+
+    async def get_rates(self, src, tgts, on_date=None):
+        return {t: await self.get_rate(src, t, on_date) for t in tgts}
+
+
+@pytest.fixture
+def async_backend():
+    install_async_backend(AsyncDummy())
+    yield
+    install_async_backend(None)
+
+
+@pytest.mark.asyncio
+async def test_ato_uses_async_backend(async_backend):
+    assert isinstance(AsyncDummy(), AsyncRateBackend)
+    assert await Money(3, "EUR").ato("USD") == Money(6, "USD")
+    assert await aconvert_amount(Decimal(1), "XXX", "EUR") == Decimal(1)
+    with pytest.raises(MissingRateError):
+        await aconvert_amount(Decimal(1), "XXX", "EUR", fallback="raise")
+
+
+@pytest.mark.asyncio
+async def test_aconvert_runs_sync_backend_off_loop(monkeypatch):
+    import threading
+    loop_thread = threading.get_ident()
+    seen = []
+
+    class SyncBackend:
+        def get_rate(self, src, tgt, on_date=None):
+            seen.append(threading.get_ident())
+            return 0.5
+
+    import asyncio
+    hops = []
+    to_thread = asyncio.to_thread
+    async def counted(fn, *args):
+        hops.append(fn)
+        return await to_thread(fn, *args)
+    monkeypatch.setattr(asyncio, "to_thread", counted)
+
+    monkeypatch.setattr(rates, "_current_backend", SyncBackend())
+    assert await aconvert_amount(Decimal(4), "USD", "EUR") == Decimal("2.0")
+    assert seen and seen[0] != loop_thread
+    # the backend exists already: one hop for the lookup, none for get_backend
+    assert len(hops) == 1
+
+
+def test_import_does_not_load_asyncio():
+    import subprocess
+    import sys
+    probe = "import sys, fxmoney; sys.exit('asyncio' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", probe]).returncode == 0
+
+
+@pytest.mark.asyncio
+async def test_async_ecb_backend(ecb_cache):
+    backend = AsyncECBBackend()
+    assert await backend.get_rate("EUR", "USD") == 1.1194
+    assert await backend.get_rates("EUR", ["USD", "JPY"]) == {"USD": 1.1194, "JPY": 121.48}
@@ -0,0 +1,43 @@
+import pytest
+from decimal import Decimal
+
+import fxmoney.rates as rates
+from fxmoney import Money, MoneyArray, MoneyBag
+
+
+class CountingBackend:
+    def __init__(self):
+        self.calls = []
+    def get_rate(self, src, tgt, on_date=None):
+        self.calls.append((src, tgt))
+        return {"USD": 0.5, "GBP": 2.0}[src]
+
+@pytest.fixture
+def backend(monkeypatch):
+    b = CountingBackend()
+    monkeypatch.setattr(rates, "_current_backend", b)
+    return b
+
+def test_accumulates_per_currency_without_conversion(backend):
+    lines = [Money("1.10", "USD"), Money("2", "EUR"), Money("0.90", "USD")] * 1000
+    bag = MoneyBag(lines)
+    assert bag["USD"] == Money(2000, "USD")
+    assert bag["EUR"] == Money(2000, "EUR")
+    assert "GBP" not in bag
+    assert backend.calls == []
+
+def test_total_one_lookup_per_currency(backend):
+    bag = MoneyBag()
+    bag += Money(10, "USD")
+    bag += Money(1, "GBP")
+    bag += Money(3, "EUR")
+    bag += MoneyArray(["10", "1"], ["USD", "GBP"])
+    assert bag.total("EUR") == Money(Decimal("17"), "EUR")
+    assert sorted(backend.calls) == [("GBP", "EUR"), ("USD", "EUR")]
+
+def test_sum_and_subtraction():
+    a = MoneyBag([Money(5, "USD")])
+    b = MoneyBag([Money(2, "USD"), Money(1, "EUR")])
+    assert sum([a, b]) == MoneyBag([Money(7, "USD"), Money(1, "EUR")])
+    assert (a - b) == MoneyBag([Money(3, "USD"), Money(-1, "EUR")])
+    assert Money(1, "USD") + a == MoneyBag([Money(6, "USD")])
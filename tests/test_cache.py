@@ -0,0 +1,83 @@
+import time
+from datetime import date
+
+from fxmoney.rates import install_backend, signals
+from fxmoney.rates.cache import CachingBackend
+from fxmoney.rates.ecb import ECBBackend
+
+
+class CountingBackend:
+    def __init__(self):
+        self.calls = 0
+        self.rate = 2.0
+    def get_rate(self, src, tgt, on_date=None):
+        self.calls += 1
+        return self.rate
+
+def test_hits_misses_and_lru_eviction():
+    inner = CountingBackend()
+    cache = CachingBackend(inner, maxsize=2)
+    for d in (date(2020, 1, 1), date(2020, 1, 1), date(2020, 1, 2), date(2020, 1, 3), date(2020, 1, 1)):
+        assert cache.get_rate("EUR", "USD", d) == 2.0
+    assert inner.calls == 4
+    assert cache.cache_info() == (1, 4, 2, 2)
+
+def test_refresh_drops_latest_only():
+    inner = CountingBackend()
+    cache = CachingBackend(inner)
+    cache.get_rate("EUR", "USD")
+    cache.get_rate("EUR", "USD", date(2020, 1, 1))
+    inner.rate = 3.0
+    signals.notify("refresh", inner)
+    assert cache.get_rate("EUR", "USD") == 3.0
+    assert cache.get_rate("EUR", "USD", date(2020, 1, 1)) == 2.0
+    # refreshes of unrelated backends are ignored
+    signals.notify("refresh", CountingBackend())
+    assert cache.cache_info().currsize == 2
+
+def test_latest_rates_expire_without_refresh_signal():
+    # e.g. HostBackend: never announces a refresh, so "latest" entries age out
+    inner = CountingBackend()
+    cache = CachingBackend(inner, maxsize=2, latest_ttl=0.05)
+    assert cache.get_rate("EUR", "USD") == 2.0
+    assert cache.get_rate("EUR", "USD", date.today()) == 2.0
+    inner.rate = 3.0
+    assert cache.get_rate("EUR", "USD") == 2.0
+    time.sleep(0.06)
+    assert cache.get_rate("EUR", "USD") == 3.0
+    assert cache.get_rate("EUR", "USD", date.today()) == 3.0
+    # "latest" entries are bounded like historical ones
+    for cur in ("GBP", "JPY", "CHF"):
+        cache.get_rate("EUR", cur)
+    assert cache.cache_info().currsize == 2
+
+def test_install_backend_invalidates(monkeypatch):
+    import fxmoney.rates as rates
+    monkeypatch.setattr(rates, "_current_backend", None)
+    inner = CountingBackend()
+    cache = CachingBackend(inner)
+    install_backend(cache)
+    cache.get_rate("EUR", "USD", date(2020, 1, 1))
+    assert cache.cache_info().currsize == 1
+    install_backend(inner)
+    assert cache.cache_info().currsize == 0
+
+def test_ecb_dates_share_effective_day(ecb_cache):
+    backend = ECBBackend()
+    cache = CachingBackend(backend)
+    # Saturday and Sunday resolve to Friday 2020-01-03
+    assert backend.effective_date(date(2020, 1, 5)) == date(2020, 1, 3)
+    cache.get_rate("USD", "JPY", date(2020, 1, 4))
+    cache.get_rate("USD", "JPY", date(2020, 1, 5))
+    assert cache.cache_info().hits == 1
+
+def test_decimal_rates_cached_separately():
+    from decimal import Decimal
+    inner = CountingBackend()
+    cache = CachingBackend(inner)
+    d = date(2020, 1, 2)
+    assert cache.get_rate_decimal("EUR", "USD", d) == Decimal("2.0")
+    assert isinstance(cache.get_rate_decimal("EUR", "USD", d), Decimal)
+    assert cache.get_rate("EUR", "USD", d) == 2.0
+    assert inner.calls == 2
+    assert cache.cache_info().hits == 1
@@ -8,14 +8,19 @@ from fxmoney.cli import main
 def dummy_get_rate(self, src: str, tgt: str, on_date=None) -> float:
     return 2.0
 
+def dummy_get_rate_decimal(self, src: str, tgt: str, on_date=None):
+    from decimal import Decimal
+    return Decimal("2.0")
+
 @pytest.fixture(autouse=True)
 def stub_ecb_rate(monkeypatch):
     """
-    Stub the ECBBackend.get_rate method so that all currency conversions
+    Stub the ECBBackend rate methods so that all currency conversions
     use a fixed rate of 2.0, without replacing the class (Lock stays intact).
     """
     import fxmoney.rates.ecb as ecb_module
     monkeypatch.setattr(ecb_module.ECBBackend, "get_rate", dummy_get_rate)
+    monkeypatch.setattr(ecb_module.ECBBackend, "get_rate_decimal", dummy_get_rate_decimal)
     yield
 
 def run_cli(args, monkeypatch, capsys):
@@ -40,3 +45,41 @@ def test_cli_convert_verbose(monkeypatch, capsys):
     lines = out.strip().splitlines()
     assert lines[0] == "Rate (EUR→USD): 2.0"
     assert lines[1] == "Result: 200.00 USD"
+
+def test_cli_convert_file_csv(tmp_path, monkeypatch, capsys):
+    src = tmp_path / "ledger.csv"
+    src.write_text("id,amount,currency,date\n1,10.005,usd,2020-01-02\n2,3,GBP,\n")
+    dst = tmp_path / "out.csv"
+    run_cli(["convert-file", str(src), "eur", "-o", str(dst), "--chunk-size", "1"], monkeypatch, capsys)
+    assert dst.read_text().splitlines() == [
+        "id,amount,currency,date,converted_amount,converted_currency",
+        "1,10.005,usd,2020-01-02,20.01,EUR",
+        "2,3,GBP,,6.00,EUR",
+    ]
+
+def test_cli_convert_file_jsonl(tmp_path, monkeypatch, capsys):
+    import json
+    src = tmp_path / "ledger.jsonl"
+    src.write_text('{"amount": "1.5", "currency": "USD"}\n\n{"amount": 2, "currency": "GBP"}\n')
+    out = run_cli(["convert-file", str(src), "JPY"], monkeypatch, capsys)
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [r["converted_amount"] for r in rows] == ["3", "4"]
+    assert {r["converted_currency"] for r in rows} == {"JPY"}
+
+def test_cli_convert_file_reports_bad_rows(tmp_path, monkeypatch, capsys):
+    src = tmp_path / "ledger.csv"
+    src.write_text("amount,currency\nabc,USD\n")
+    with pytest.raises(SystemExit) as exc:
+        run_cli(["convert-file", str(src), "EUR"], monkeypatch, capsys)
+    assert exc.value.code == 1
+    assert "row 1" in capsys.readouterr().err
+
+def test_cli_convert_file_empty_csv_keeps_header(tmp_path, monkeypatch, capsys):
+    src = tmp_path / "ledger.csv"
+    src.write_text("id,amount,currency\n")
+    dst = tmp_path / "out.csv"
+    run_cli(["convert-file", str(src), "EUR", "-o", str(dst)], monkeypatch, capsys)
+    assert dst.read_text().splitlines() == ["id,amount,currency,converted_amount,converted_currency"]
+    src.write_text("")
+    run_cli(["convert-file", str(src), "EUR", "-o", str(dst)], monkeypatch, capsys)
+    assert dst.read_text().splitlines() == ["converted_amount,converted_currency"]
@@ -0,0 +1,82 @@
+import time
+from decimal import Decimal
+
+import pytest
+
+from fxmoney.rates.composite import CompositeBackend
+from fxmoney.rates.exceptions import MissingRateError, RateProviderError
+
+
+class Fixed:
+    def __init__(self, rate, delay=0.0, error=None):
+        self.rate, self.delay, self.error = rate, delay, error
+        self.calls = 0
+    def get_rate(self, src, tgt, on_date=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.rate
+
+
+def test_tiers_fall_through_in_order():
+    missing = Fixed(None, error=MissingRateError("no rate"))
+    broken = Fixed(None, error=RateProviderError("down"))
+    backend = CompositeBackend([missing, broken, Fixed(2.5)])
+    assert backend.get_rate_decimal("EUR", "USD") == Decimal("2.5")
+    assert backend.get_rate("EUR", "USD") == 2.5
+    # a missing rate is an answer; only the provider error counts
+    assert backend.tiers[0].failures == 0 and backend.tiers[1].failures == 2
+
+def test_all_tiers_failing_raises_missing_rate():
+    backend = CompositeBackend([Fixed(None, error=ValueError("bad")), Fixed(None, error=MissingRateError("none"))])
+    with pytest.raises(MissingRateError, match="ValueError|bad"):
+        backend.get_rate("EUR", "USD")
+
+def test_timeout_bounds_slow_tier():
+    slow = Fixed(1.0, delay=0.5)
+    backend = CompositeBackend([slow, Fixed(2.0)], timeouts=[0.05, None])
+    start = time.monotonic()
+    assert backend.get_rate("EUR", "USD") == 2.0
+    assert time.monotonic() - start < 0.3
+    assert backend.tiers[0].failures == 1
+    backend.close()
+
+def test_hedged_request_wins_without_failing_primary():
+    slow = Fixed(1.0, delay=0.4)
+    backend = CompositeBackend([slow, Fixed(2.0)], hedge_after=0.05)
+    start = time.monotonic()
+    assert backend.get_rate("EUR", "USD") == 2.0
+    assert time.monotonic() - start < 0.3
+    time.sleep(0.5)   # the abandoned primary still settles as healthy
+    assert backend.tiers[0].state == "closed" and backend.tiers[0].failures == 0
+    backend.close()
+
+def test_circuit_breaker_skips_and_retries_dead_tier():
+    dead = Fixed(None, error=RateProviderError("down"))
+    backend = CompositeBackend([dead, Fixed(2.0)], failure_threshold=2, reset_after=0.1)
+    for _ in range(4):
+        assert backend.get_rate("EUR", "USD") == 2.0
+    assert dead.calls == 2 and backend.tiers[0].state == "open"
+    time.sleep(0.15)
+    assert backend.tiers[0].state == "half-open"
+    dead.error = None
+    dead.rate = 1.5
+    assert backend.get_rate("EUR", "USD") == 1.5
+    assert backend.tiers[0].state == "closed"
+
+
+def test_failing_host_tier_fails_over():
+    requests = pytest.importorskip("requests")
+    from fxmoney.rates.host import HostBackend
+
+    class Offline:
+        def get(self, url, params, timeout):
+            raise requests.ConnectionError("offline")
+
+    with pytest.raises(ValueError, match="fallback='raise'"):
+        CompositeBackend([HostBackend(session=Offline()), Fixed(1.5)])
+    host = HostBackend(session=Offline(), fallback="raise")
+    backend = CompositeBackend([host, Fixed(1.5)])
+    assert backend.get_rate_decimal("EUR", "USD") == Decimal("1.5")
+    assert backend.tiers[0].failures == 1
@@ -32,3 +32,12 @@ def test_comparison_same_currency():
     assert b > a
     assert a != b
     assert a == Money("3.00", "CHF")
+
+def test_fast_paths_keep_results():
+    m = Money(Decimal("2.50"), "usd")
+    assert m.currency == "USD" and m.currency is Money(1, "Usd").currency
+    assert (m * 3).amount == Decimal("7.50")
+    assert (m * Decimal("0.1")).amount == Decimal("0.250")
+    assert (m * 1.5).amount == Decimal("3.750")
+    assert (m / 4).amount == Decimal("0.625")
+    assert type((m + m).amount) is Decimal and (m + m).currency == "USD"
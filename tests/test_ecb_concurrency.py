@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import time
+
+import fxmoney.rates.ecb as ecb
+from conftest import ECB_CSV, write_ecb_zip
+
+WORKER = r"""
+import os, sys, time
+import fxmoney.rates.ecb as ecb
+d = sys.argv[1]
+for name, file in [("CACHE_DIR", ""), ("CACHE_ZIP", "eurofxref-hist.zip"),
+                   ("CACHE_CSV", "eurofxref-hist.csv"), ("CACHE_SNAPSHOT", "eurofxref-hist.fxrt"),
+                   ("CACHE_INCR", "eurofxref-incr.csv"), ("CACHE_LOCK", "eurofxref.lock")]:
+    setattr(ecb, name, os.path.join(d, file))
+ecb.ZIP_URL = "file://" + os.path.join(d, "remote", "eurofxref-hist.zip")
+ecb.FEED_URL = "file://" + os.path.join(d, "remote", "missing.xml")
+download = ecb.ECBBackend._download_and_extract
+def counted(self):
+    with open(os.path.join(d, "downloads"), "a") as f:
+        f.write("x")
+    time.sleep(0.3)
+    download(self)
+ecb.ECBBackend._download_and_extract = counted
+print(ecb.ECBBackend().get_rate("EUR", "USD"))
+"""
+
+
+def test_concurrent_workers_download_once(ecb_cache):
+    write_ecb_zip(str(ecb_cache / "remote" / "eurofxref-hist.zip"), ECB_CSV.replace("1.1194", "1.2500"))
+    past = time.time() - 2 * ecb.MAX_AGE
+    os.utime(ecb.CACHE_ZIP, (past, past))
+
+    workers = [
+        subprocess.Popen([sys.executable, "-c", WORKER, str(ecb_cache)], stdout=subprocess.PIPE, text=True)
+        for _ in range(4)
+    ]
+    outputs = [w.communicate(timeout=30)[0].strip() for w in workers]
+    assert outputs == ["1.25"] * 4
+    assert (ecb_cache / "downloads").read_text() == "x"
+    # no temp files left behind
+    assert not [n for n in os.listdir(ecb_cache) if n.endswith(".tmp")]
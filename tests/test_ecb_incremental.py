@@ -0,0 +1,121 @@
+import os
+import time
+from datetime import date
+
+import pytest
+
+import fxmoney.rates.ecb as ecb
+from fxmoney.rates.ecb import ECBBackend, parse_feed
+from fxmoney.rates.table import RateTable
+from conftest import ECB_CSV, write_ecb_zip
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<gesmes:Envelope xmlns:gesmes="http://www.gesmes.org/xml/2002-08-01"
+                 xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref">
+  <gesmes:subject>Reference rates</gesmes:subject>
+  <Cube>
+    <Cube time="%(d2)s">
+      <Cube currency="USD" rate="1.1200"/><Cube currency="JPY" rate="122.00"/>
+    </Cube>
+    <Cube time="%(d1)s">
+      <Cube currency="USD" rate="1.1194"/><Cube currency="JPY" rate="121.48"/>
+    </Cube>
+  </Cube>
+</gesmes:Envelope>
+"""
+
+
+def _make_stale():
+    past = time.time() - 2 * ecb.MAX_AGE
+    os.utime(ecb.CACHE_ZIP, (past, past))
+
+
+def _remote(ecb_cache, name):
+    return str(ecb_cache / "remote" / name)
+
+
+def test_parse_feed():
+    table = parse_feed(FEED % {b"d1": b"2020-01-06", b"d2": b"2020-01-07"})
+    assert table.latest == date(2020, 1, 7)
+    assert str(table.rate(1, table.column("JPY"))) == "122.0"
+
+
+def test_incremental_merge_skips_full_download(ecb_cache, monkeypatch):
+    with open(_remote(ecb_cache, "eurofxref-hist-90d.xml"), "wb") as f:
+        f.write(FEED % {b"d1": b"2020-01-06", b"d2": b"2020-01-07"})
+    _make_stale()
+    monkeypatch.setattr(ECBBackend, "_download_and_extract", lambda self: pytest.fail("full download"))
+
+    backend = ECBBackend()
+    assert backend.effective_date() == date(2020, 1, 7)
+    assert backend.get_rate("EUR", "USD") == 1.12
+    # GBP is not in the feed: falls back to the last full-history day
+    assert backend.get_rate("EUR", "GBP") == 0.85098
+    assert os.path.exists(ecb.CACHE_INCR)
+
+    # the merged days survive a restart, served from the snapshot
+    monkeypatch.setattr(RateTable, "from_csv", classmethod(lambda cls, p: pytest.fail("CSV parsed")))
+    assert ECBBackend().get_rate("EUR", "USD") == 1.12
+
+
+def test_new_feed_days_are_appended_without_reparsing(ecb_cache, monkeypatch):
+    feed = _remote(ecb_cache, "eurofxref-hist-90d.xml")
+    with open(feed, "wb") as f:
+        f.write(FEED % {b"d1": b"2020-01-06", b"d2": b"2020-01-07"})
+    _make_stale()
+    backend = ECBBackend()
+    with open(ecb.CACHE_INCR) as f:
+        side = f.read()
+
+    with open(feed, "wb") as f:
+        f.write(FEED % {b"d1": b"2020-01-07", b"d2": b"2020-01-08"})
+    past = time.time() - 2 * ecb.MAX_AGE
+    os.utime(ecb.CACHE_INCR, (past, past))
+    with monkeypatch.context() as m:
+        m.setattr(RateTable, "from_csv", classmethod(lambda cls, p: pytest.fail("CSV parsed")))
+        m.setattr(ECBBackend, "_download_and_extract", lambda self: pytest.fail("full download"))
+        backend.refresh()
+    assert backend.effective_date() == date(2020, 1, 8)
+    with open(ecb.CACHE_INCR) as f:
+        appended = f.read()
+    assert appended.startswith(side) and appended.count("\n") == side.count("\n") + 1
+
+    # parsing the CSVs from scratch gives the same table
+    os.remove(ecb.CACHE_SNAPSHOT)
+    fresh = ECBBackend()._table
+    assert [fresh.row(i) for i in range(len(fresh))] == [
+        backend._table.row(i) for i in range(len(backend._table))
+    ]
+
+
+def test_days_appended_by_another_process_are_not_repeated(ecb_cache):
+    feed = _remote(ecb_cache, "eurofxref-hist-90d.xml")
+    idle = ECBBackend()   # loaded up to 2020-01-06
+    with open(feed, "wb") as f:
+        f.write(FEED % {b"d1": b"2020-01-06", b"d2": b"2020-01-07"})
+    _make_stale()
+    ECBBackend()          # another worker appends 2020-01-07
+
+    with open(feed, "wb") as f:
+        f.write(FEED % {b"d1": b"2020-01-07", b"d2": b"2020-01-08"})
+    past = time.time() - 2 * ecb.MAX_AGE
+    os.utime(ecb.CACHE_INCR, (past, past))
+    idle.refresh()
+    with open(ecb.CACHE_INCR) as f:
+        assert f.read().count("2020-01-07") == 1
+    days = [d for d, _ in idle.get_series("EUR", "USD", date(2020, 1, 6), date(2020, 1, 8), fill=None)]
+    assert days == [date(2020, 1, 6), date(2020, 1, 7), date(2020, 1, 8)]
+
+
+def test_gap_triggers_full_download(ecb_cache):
+    with open(_remote(ecb_cache, "eurofxref-hist-90d.xml"), "wb") as f:
+        f.write(FEED % {b"d1": b"2020-03-02", b"d2": b"2020-03-03"})
+    write_ecb_zip(
+        _remote(ecb_cache, "eurofxref-hist.zip"),
+        ECB_CSV.replace("Date,USD,JPY,GBP,\n", "Date,USD,JPY,GBP,\n2020-03-03,1.5,120,0.9,\n"),
+    )
+    _make_stale()
+    backend = ECBBackend()
+    assert backend.effective_date() == date(2020, 3, 3)
+    assert backend.get_rate("EUR", "USD") == 1.5
+    assert not os.path.exists(ecb.CACHE_INCR)
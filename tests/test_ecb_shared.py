@@ -0,0 +1,77 @@
+import errno
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import fxmoney.rates.ecb as ecb
+from fxmoney.rates._filelock import FileLock
+from fxmoney.rates.ecb import ECBBackend
+from fxmoney.rates.table import RateTable
+from conftest import ECB_CSV, write_ecb_zip
+
+
+def test_file_lock_excludes_other_processes(tmp_path):
+    path = str(tmp_path / "test.lock")
+    probe = (
+        "import sys; from fxmoney.rates._filelock import FileLock; "
+        f"sys.exit(0 if FileLock({path!r}).acquire(blocking=False) else 3)"
+    )
+    with FileLock(path):
+        assert subprocess.run([sys.executable, "-c", probe]).returncode == 3
+    assert subprocess.run([sys.executable, "-c", probe]).returncode == 0
+
+
+def test_workers_attach_to_one_snapshot(ecb_cache, monkeypatch):
+    first = ECBBackend(shared=True)
+    generation = first._table.generation
+    assert generation == RateTable.read_generation(ecb.CACHE_SNAPSHOT) >= 1
+
+    # later workers must map the published snapshot, not parse the CSV
+    monkeypatch.setattr(RateTable, "from_csv", classmethod(lambda cls, p: pytest.fail("CSV parsed")))
+    second = ECBBackend(shared=True)
+    assert second._table.generation == generation
+    assert second.get_rate("EUR", "USD") == 1.1194
+
+
+def test_refresh_is_published_by_generation(ecb_cache):
+    reader = ECBBackend(shared=True)
+    writer = ECBBackend(shared=True)
+    # the writer's cache expires and it downloads a newer history
+    write_ecb_zip(
+        str(ecb_cache / "remote" / "eurofxref-hist.zip"),
+        ECB_CSV.replace("2020-01-06,1.1194", "2020-01-07,1.3000,121.00,0.85,\n2020-01-06,1.1194"),
+    )
+    past = time.time() - 2 * ecb.MAX_AGE
+    os.utime(ecb.CACHE_ZIP, (past, past))
+    writer.refresh()
+    assert writer._table.generation == reader._table.generation + 1
+
+    # the reader notices on its next poll
+    reader._expires_at = 0
+    reader.get_rate("EUR", "USD")
+    deadline = time.time() + 5
+    while reader.get_rate("EUR", "USD") != 1.3 and time.time() < deadline:
+        time.sleep(0.01)
+    assert reader._table.generation == writer._table.generation
+
+
+def test_read_only_cache_dir_is_served_without_lock_file(ecb_cache, monkeypatch):
+    class Unlockable(FileLock):
+        def acquire(self, blocking=True):
+            raise PermissionError(errno.EROFS, "Read-only file system", self.path)
+
+    # a fresh cache is loaded without touching the lock file
+    monkeypatch.setattr(ecb, "FileLock", lambda path: pytest.fail("lock file opened"))
+    assert ECBBackend().get_rate("EUR", "USD") == 1.1194
+
+    # stale but read-only: load the cached files instead of failing or downloading
+    monkeypatch.setattr(ecb, "FileLock", Unlockable)
+    monkeypatch.setattr(ECBBackend, "_download_and_extract", lambda self: pytest.fail("downloaded"))
+    past = time.time() - 2 * ecb.MAX_AGE
+    os.utime(ecb.CACHE_ZIP, (past, past))
+    backend = ECBBackend()
+    assert backend.get_rate("EUR", "USD") == 1.1194
+    assert backend._expires_at > time.time()
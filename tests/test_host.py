@@ -0,0 +1,140 @@
+import json
+import threading
+from datetime import date
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+pytest.importorskip("requests")
+
+from fxmoney.rates.exceptions import MissingRateError
+from fxmoney.rates.host import HostBackend
+
+TABLES = {
+    "2020-01-02": {"USD": 1.1193, "JPY": 121.75, "GBP": 0.84828},
+    "2020-01-03": {"USD": 1.1147, "JPY": 121.20, "GBP": 0.85115},
+    "2020-01-06": {"USD": 1.1194, "JPY": 121.48, "GBP": 0.85098},
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal exchangerate.host look-alike: /latest, /YYYY-MM-DD, /timeseries."""
+    requests_seen: list = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        StubHandler.requests_seen.append(url.path)
+        assert query["base"] == "EUR"
+        if url.path == "/latest":
+            body = {"base": "EUR", "date": "2020-01-06", "rates": TABLES["2020-01-06"]}
+        elif url.path == "/timeseries":
+            days = {d: r for d, r in TABLES.items() if query["start_date"] <= d <= query["end_date"]}
+            body = {"base": "EUR", "rates": days}
+        elif url.path == "/2021-02-01":
+            body = {"success": False, "error": {"code": 104, "type": "usage_limit_reached"}}
+        elif url.path.lstrip("/") in TABLES:
+            body = {"base": "EUR", "rates": TABLES[url.path.lstrip("/")]}
+        else:
+            self.send_error(404)
+            return
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_cross_rates_from_one_table(stub_url):
+    hb = HostBackend(base_url=stub_url)
+    d = date(2020, 1, 2)
+    assert hb.get_rate("EUR", "USD", d) == 1.1193
+    assert hb.get_rate("USD", "JPY", d) == pytest.approx(121.75 / 1.1193)
+    assert hb.get_rate("GBP", "EUR", d) == pytest.approx(1 / 0.84828)
+    assert hb.get_rate("JPY", "USD") == pytest.approx(1.1194 / 121.48)
+    assert StubHandler.requests_seen == ["/2020-01-02", "/latest"]
+
+
+def test_prefetch_range_in_one_request(stub_url):
+    hb = HostBackend(base_url=stub_url)
+    assert hb.prefetch(date(2020, 1, 2), date(2020, 1, 6)) == 5
+    # weekend days reuse Friday's table
+    assert hb.get_rate("EUR", "USD", date(2020, 1, 4)) == 1.1147
+    assert hb.get_rate("USD", "GBP", date(2020, 1, 6)) == pytest.approx(0.85098 / 1.1194)
+    assert StubHandler.requests_seen == ["/timeseries"]
+
+
+def test_series_and_table_in_one_request_each(stub_url):
+    hb = HostBackend(base_url=stub_url)
+    series = hb.get_series("EUR", "USD", date(2020, 1, 2), date(2020, 1, 6))
+    assert [d.day for d, _ in series] == [2, 3, 4, 5, 6]
+    assert [float(r) for _, r in series] == [1.1193, 1.1147, 1.1147, 1.1147, 1.1194]
+    assert [d.day for d, _ in hb.get_series(
+        "USD", "GBP", date(2020, 1, 2), date(2020, 1, 6), fill=None
+    )] == [2, 3, 6]
+    table = hb.get_table(date(2020, 1, 2), ["usd", "EUR", "XXX"])
+    assert table == {"USD": Decimal("1.1193"), "EUR": 1}
+    assert set(hb.get_table(date(2020, 1, 2))) == {"USD", "JPY", "GBP"}
+    # the second range is a cached historical response
+    assert StubHandler.requests_seen == ["/timeseries", "/2020-01-02"]
+
+
+def test_unknown_currency_raises(stub_url):
+    hb = HostBackend(base_url=stub_url)
+    with pytest.raises(MissingRateError):
+        hb.get_rate("EUR", "XXX", date(2020, 1, 2))
+
+
+def test_fallback_raise_reports_provider_errors(stub_url):
+    from fxmoney.rates.exceptions import RateProviderError
+    backend = HostBackend(base_url=stub_url, fallback="raise")
+    with pytest.raises(RateProviderError):
+        backend.get_rate("EUR", "USD", date(2021, 1, 1))
+
+
+def test_store_read_through_and_offline_fallback(stub_url):
+    from fxmoney.rates.store import SQLiteRateStore
+    store = SQLiteRateStore(":memory:")
+    online = HostBackend(base_url=stub_url, store=store)
+    assert online.get_rate("EUR", "USD", date(2020, 1, 3)) == 1.1147
+    assert online.prefetch(date(2020, 1, 2), date(2020, 1, 6)) == 5
+    assert len(StubHandler.requests_seen) == 2
+
+    # a fresh backend (e.g. after a restart) with the upstream gone
+    offline = HostBackend(base_url="http://127.0.0.1:9", store=store, fallback="raise")
+    assert offline.get_rate("EUR", "GBP", date(2020, 1, 2)) == 0.84828
+    assert offline.get_rate("EUR", "JPY") == 121.48   # newest stored table
+    assert len(StubHandler.requests_seen) == 2
+
+
+def test_error_bodies_are_provider_errors_and_not_cached(stub_url):
+    from fxmoney.rates.exceptions import RateProviderError
+    from fxmoney.rates.store import SQLiteRateStore
+    backend = HostBackend(base_url=stub_url, fallback="raise")
+    for _ in range(2):
+        with pytest.raises(RateProviderError):
+            backend.get_rate("EUR", "USD", date(2021, 2, 1))
+    assert StubHandler.requests_seen == ["/2021-02-01", "/2021-02-01"]
+
+    # with a store, the newest stored table is served instead
+    store = SQLiteRateStore(":memory:")
+    store.put_tables("EUR", [(date(2021, 1, 29), {"USD": 1.2136})])
+    assert HostBackend(base_url=stub_url, store=store, fallback="raise").get_rate(
+        "EUR", "USD", date(2021, 2, 1)
+    ) == 1.2136
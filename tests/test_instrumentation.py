@@ -0,0 +1,86 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from fxmoney import instrumentation
+from fxmoney.rates import convert_amount
+from fxmoney.rates.cache import CachingBackend
+from fxmoney.rates.ecb import ECBBackend
+from fxmoney.rates.exceptions import MissingRateError
+
+
+@pytest.fixture(autouse=True)
+def metrics():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def _counters():
+    return {
+        (c["name"], tuple(sorted(c["labels"].items()))): c["value"]
+        for c in instrumentation.snapshot()["counters"]
+    }
+
+
+class Missing:
+    def get_rate_decimal(self, src, tgt, on_date=None):
+        raise MissingRateError("no rate")
+
+
+def test_disabled_records_nothing():
+    instrumentation.disable()
+    instrumentation.count("x")
+    with instrumentation.timed("y"):
+        pass
+    assert instrumentation.snapshot() == {"counters": [], "histograms": []}
+
+
+def test_lookups_fallbacks_and_listeners(monkeypatch):
+    events = []
+    def listener(*event):
+        events.append(event)
+    instrumentation.add_listener(listener)
+    try:
+        monkeypatch.setattr("fxmoney.rates._current_backend", Missing())
+        assert convert_amount(Decimal(5), "EUR", "USD", fallback="last") == 5
+    finally:
+        instrumentation.remove_listener(listener)
+    assert _counters()[("rate.fallback", (("reason", "missing"), ("source", "convert")))] == 1
+    (hist,) = instrumentation.snapshot()["histograms"]
+    assert hist["name"] == "rate.lookup" and hist["labels"] == {"backend": "Missing"}
+    assert hist["count"] == 1 and sum(n for _, n in hist["buckets"]) == 1
+    assert [e[:2] for e in events] == [("histogram", "rate.lookup"), ("counter", "rate.fallback")]
+
+
+def test_cache_and_ecb_metrics(ecb_cache):
+    cache = CachingBackend(ECBBackend())
+    for _ in range(3):
+        cache.get_rate("USD", "JPY", date(2020, 1, 3))
+    # GBP has no quote on 2020-01-03 → previous business day
+    cache.get_rate("GBP", "USD", date(2020, 1, 3))
+    counters = _counters()
+    assert counters[("cache.hit", ())] == 2
+    assert counters[("cache.miss", ())] == 2
+    assert counters[("rate.fallback", (("reason", "previous_day"), ("source", "ecb")))] == 1
+    names = {(h["name"], h["labels"].get("source")) for h in instrumentation.snapshot()["histograms"]}
+    assert {("ecb.refresh", None), ("ecb.load_rates", "csv")} <= names
+
+
+@pytest.mark.asyncio
+async def test_updater_errors_are_counted(monkeypatch):
+    import fxmoney.updater as updater
+
+    def broken():
+        raise OSError("offline")
+    monkeypatch.setattr(updater, "ECBBackend", broken)
+    stop = asyncio.Event()
+    task = asyncio.create_task(updater.async_background_update(0.01, stop))
+    await asyncio.sleep(0.05)
+    stop.set()
+    await task
+    assert _counters()[("updater.error", (("error", "OSError"),))] >= 1
@@ -0,0 +1,87 @@
+import pytest
+from decimal import Decimal
+
+import fxmoney.rates as rates
+from fxmoney import Money, MoneyArray
+
+
+class FixedBackend:
+    """USD→EUR = 0.5, everything else 1:1; counts lookups."""
+    def __init__(self):
+        self.calls = 0
+    def get_rate(self, src, tgt, on_date=None):
+        self.calls += 1
+        if (src, tgt) == ("USD", "EUR"):
+            return 0.5
+        if (src, tgt) == ("EUR", "USD"):
+            return 2.0
+        return 1.0
+
+@pytest.fixture
+def backend(monkeypatch):
+    b = FixedBackend()
+    monkeypatch.setattr(rates, "_current_backend", b)
+    return b
+
+def test_minor_units_and_quantization():
+    arr = MoneyArray(["1.005", "2", "3.999"], "EUR")
+    assert arr.amounts == [Decimal("1.00"), Decimal("2.00"), Decimal("4.00")]
+    jpy = MoneyArray(["1234.5"], "jpy")
+    assert jpy.amounts == [Decimal("1234")]
+    assert list(jpy) == [Money("1234", "JPY")]
+
+def test_exact_mode_keeps_decimals():
+    arr = MoneyArray(["1.005"], "EUR", exact=True)
+    assert arr.amounts == [Decimal("1.005")]
+    assert arr.quantize().amounts == [Decimal("1.00")]
+    assert arr.to_dicts() == [{"amount": "1.00", "currency": "EUR"}]
+
+def test_same_currency_arithmetic_and_compare():
+    a = MoneyArray(["1.10", "2.20"], "EUR")
+    b = MoneyArray(["0.10", "5.00"], "EUR")
+    assert (a + b).amounts == [Decimal("1.20"), Decimal("7.20")]
+    assert (a - b).amounts == [Decimal("1.00"), Decimal("-2.80")]
+    assert (a * 3).amounts == [Decimal("3.30"), Decimal("6.60")]
+    assert (a / 4).amounts == [Decimal("0.28"), Decimal("0.55")]
+    assert (a < b) == [False, True]
+    assert (a == a) == [True, True]
+
+def test_mixed_currency(backend):
+    a = MoneyArray(["10", "10"], ["EUR", "USD"])
+    b = MoneyArray(["10", "10"], ["USD", "USD"])
+    assert (a + b).amounts == [Decimal("15.00"), Decimal("20.00")]
+    assert (a + Money(2, "USD")).amounts == [Decimal("11.00"), Decimal("12.00")]
+    assert a.group_by_currency() == {"EUR": Money(10, "EUR"), "USD": Money(10, "USD")}
+
+def test_to_and_sum_lookup_once_per_currency(backend):
+    arr = MoneyArray(["2"] * 100 + ["4"] * 100, ["USD"] * 100 + ["EUR"] * 100)
+    backend.calls = 0
+    total = arr.sum("EUR")
+    assert total == Money(500, "EUR")
+    assert backend.calls == 1
+    converted = arr.to("EUR")
+    assert converted.currencies == ["EUR"] * 200
+    assert converted.amounts[0] == Decimal("1.00")
+
+def test_as_numpy_view():
+    np = pytest.importorskip("numpy")
+    arr = MoneyArray(["1.50", "2"], "EUR")
+    view = arr.as_numpy()
+    assert view.dtype == np.int64 and view.tolist() == [150, 200]
+
+def test_indexing_reads_one_element_and_slices_share_layout(monkeypatch):
+    arr = MoneyArray(["1.50", "200", "3"], ["EUR", "JPY", "EUR"])
+    monkeypatch.setattr(MoneyArray, "amounts", property(lambda self: pytest.fail("materialised")))
+    assert arr[1] == Money("200", "JPY") and arr[-1] == Money("3", "EUR")
+    tail = arr[1:]
+    assert isinstance(tail, MoneyArray) and tail[0] == Money("200", "JPY") and len(tail) == 2
+    exact = MoneyArray(["1.005", "2"], "EUR", exact=True)
+    assert exact[0].amount == Decimal("1.005") and exact[::-1][0] == Money(2, "EUR")
+
+def test_int64_overflow_falls_back_to_exact_decimals():
+    big = MoneyArray([Decimal(2**62) / 100], "EUR")
+    total = big + big
+    assert total.amounts == [Decimal(2**63) / 100]
+    assert (big * 4).amounts == [Decimal(2**64) / 100]
+    with pytest.raises(TypeError):
+        total.as_numpy()
@@ -32,3 +32,28 @@ def test_override_currency_decimals():
         **settings.currency_decimals,
         "EUR": 2
     })
+
+def test_quantize_many_and_to_dicts_follow_setters():
+    from fxmoney.core import quantize_many, to_dicts
+    items = [Money("1.005", "EUR"), Money("7.5", "JPY"), Money("2.34567", "XYZ")]
+    assert quantize_many(items) == [Decimal("1.00"), Decimal("8"), Decimal("2.35")]
+    assert to_dicts(items) == [m.to_dict() for m in items]
+    original = dict(settings.currency_decimals)
+    try:
+        set_currency_decimals("XYZ", 4)
+        assert str(items[2]) == "2.3457 XYZ"
+        settings.currency_decimals = {**original, "JPY": 1}
+        assert quantize_many(items[1:2]) == [Decimal("7.5")]
+    finally:
+        set_all_currency_decimals(original)
+
+def test_in_place_currency_decimals_changes_apply():
+    original = dict(settings.currency_decimals)
+    try:
+        assert Money("1.2345", "JPY").to_dict()["amount"] == "1"
+        settings.currency_decimals["JPY"] = 3
+        assert Money("1.2345", "JPY").to_dict()["amount"] == "1.234"
+        del settings.currency_decimals["JPY"]
+        assert str(Money("1.2345", "JPY")) == "1.23 JPY"
+    finally:
+        set_all_currency_decimals(original)
@@ -0,0 +1,98 @@
+import math
+import os
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from fxmoney.rates.table import RateTable
+
+CSV = (
+    "Date,USD,JPY,CYP,\n"
+    "2020-01-06,1.1194,121.48,N/A,\n"
+    "2020-01-03,1.1147,N/A,N/A,\n"
+    "2020-01-02,1.1193,121.75,0.5734,\n"
+)
+
+def _write(tmp_path):
+    path = tmp_path / "eurofxref-hist.csv"
+    path.write_text(CSV)
+    return str(path)
+
+def test_from_csv_is_ascending_and_exact(tmp_path):
+    table = RateTable.from_csv(_write(tmp_path))
+    assert table.currencies == ("USD", "JPY", "CYP")
+    assert table.first == date(2020, 1, 2)
+    assert table.latest == date(2020, 1, 6)
+    assert table.row(0) == {"USD": Decimal("1.1193"), "JPY": Decimal("121.75"), "CYP": Decimal("0.5734")}
+    assert table.row(1) == {"USD": Decimal("1.1147")}
+
+def test_lookup_semantics():
+    table = RateTable.from_rows([
+        (date(2020, 1, 3), {"USD": 1.2}),
+        (date(2020, 1, 2), {"USD": 1.1, "JPY": 120}),
+    ])
+    assert table.row_on_or_before(date(2020, 1, 1)) == -1
+    assert table.row_on_or_before(date(2020, 1, 5)) == 1
+    jpy = table.column("JPY")
+    assert table.last_valid_row(jpy, 1) == 0
+    assert table.column("GBP") is None
+    assert math.isnan(table.values[1 * 2 + jpy])
+
+def test_merge_appends_or_rebuilds_like_from_rows(tmp_path):
+    table = RateTable.from_csv(_write(tmp_path))
+    mapped_path = str(tmp_path / "rates.fxrt")
+    table.save(mapped_path, b"k")
+    mapped = RateTable.load(mapped_path, b"k")
+    rows = lambda t: [(t.date_at(i), t.row(i)) for i in range(len(t))]
+    later = RateTable.from_rows([(date(2020, 1, 8), {"JPY": 122}), (date(2020, 1, 7), {"USD": 1.2})])
+    overlap = RateTable.from_rows([(date(2020, 1, 3), {"GBP": 0.85}), (date(2020, 1, 9), {"USD": 1.3})])
+    for other in (later, overlap):
+        merged = mapped.merge(other)
+        expected = RateTable.from_rows(dict(rows(table) + rows(other)).items())
+        assert rows(merged) == rows(expected)
+        assert [merged.last_valid_row(merged.column(c), len(merged) - 1) for c in ("USD", "JPY")] == [
+            expected.last_valid_row(expected.column(c), len(expected) - 1) for c in ("USD", "JPY")
+        ]
+    assert table.merge(RateTable.from_rows([])) is table
+
+def test_append_csv_keeps_file_columns(tmp_path):
+    path = _write(tmp_path)
+    new = RateTable.from_rows([(date(2020, 1, 7), {"JPY": 122})])
+    assert new.append_csv(path)
+    assert RateTable.from_csv(path).row(3) == {"JPY": Decimal("122.0")}
+    assert not RateTable.from_rows([(date(2020, 1, 8), {"GBP": 1})]).append_csv(path)
+    assert not new.append_csv(str(tmp_path / "missing.csv"))
+    assert os.listdir(tmp_path) == [os.path.basename(path)]   # no temp file left
+
+
+def test_repeated_day_keeps_last_row(tmp_path):
+    path = _write(tmp_path)
+    assert RateTable.from_rows([(date(2020, 1, 6), {"USD": 1.5})]).append_csv(path)
+    table = RateTable.from_csv(path)
+    assert list(table.dates) == sorted(set(table.dates))
+    assert table.row(len(table) - 1)["USD"] == Decimal("1.5")
+    rows = RateTable.from_rows([(date(2020, 1, 7), {"USD": 1}), (date(2020, 1, 7), {"USD": 2})])
+    assert len(rows) == 1 and rows.row(0) == {"USD": Decimal("2.0")}
+
+def test_snapshot_roundtrip_and_key(tmp_path):
+    table = RateTable.from_csv(_write(tmp_path))
+    path = str(tmp_path / "rates.fxrt")
+    table.save(path, b"key-1")
+    loaded = RateTable.load(path, b"key-1")
+    assert loaded.currencies == table.currencies
+    assert list(loaded.dates) == list(table.dates)
+    assert [loaded.row(i) for i in range(len(loaded))] == [table.row(i) for i in range(len(table))]
+    assert loaded.row_on_or_before(date(2020, 1, 5)) == 1
+    # snapshot of other source data is ignored
+    assert RateTable.load(path, b"key-2") is None
+    assert RateTable.load(str(tmp_path / "missing.fxrt"), b"key-1") is None
+
+def test_ecb_backend_writes_and_reuses_snapshot(ecb_cache, monkeypatch):
+    from fxmoney.rates import ecb
+    first = ecb.ECBBackend()
+    assert os.path.exists(ecb.CACHE_SNAPSHOT)
+    # a valid snapshot must be used instead of the CSV
+    monkeypatch.setattr(RateTable, "from_csv", classmethod(lambda cls, p: pytest.fail("CSV parsed")))
+    second = ecb.ECBBackend()
+    assert second.get_rate("EUR", "USD") == first.get_rate("EUR", "USD") == 1.1194
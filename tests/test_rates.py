@@ -1,11 +1,13 @@
 import pytest
 import requests
 from datetime import date  # <-- hinzugefügt
+from decimal import Decimal
 
 from fxmoney.config import set_fallback_mode
 from fxmoney.rates import get_backend, install_backend, convert_amount
 from fxmoney.rates.ecb import ECBBackend
 from fxmoney.rates.host import HostBackend
+from fxmoney.rates.table import RateTable
 from fxmoney.rates.exceptions import MissingRateError
 
 # --- ECB backend default --------------------------------------------------
@@ -34,7 +36,7 @@ class DummyResp:
     def raise_for_status(self):
         pass
     def json(self):
-        return {"info": {"rate": self._rate}}
+        return {"base": "EUR", "rates": {"USD": self._rate}}
 
 @pytest.fixture(autouse=True)
 def reset_fallback():
@@ -42,26 +44,314 @@ def reset_fallback():
     yield
     set_fallback_mode("last")
 
-def test_host_backend_success(monkeypatch):
+class DummySession:
+    """Stands in for requests.Session; `result` is a rate or an exception."""
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+    def get(self, url, params, timeout):
+        self.calls.append(params)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return DummyResp(self.result)
+
+def test_host_backend_success():
     set_fallback_mode("last")
-    hb = HostBackend()
     # simulate a successful API response with rate=1.2345
-    monkeypatch.setattr(requests, "get", lambda url, params, timeout: DummyResp(1.2345))
+    hb = HostBackend(session=DummySession(1.2345))
     rate = hb.get_rate("EUR", "USD")
     assert pytest.approx(rate, rel=1e-8) == 1.2345
 
-def test_host_backend_fallback_last(monkeypatch):
+def test_host_backend_fallback_last():
     set_fallback_mode("last")
-    hb = HostBackend()
     # simulate a network error
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: (_ for _ in ()).throw(requests.RequestException()))
+    hb = HostBackend(session=DummySession(requests.RequestException()))
     # with fallback="last", error should be swallowed and 1.0 returned
     rate = hb.get_rate("EUR", "USD")
     assert rate == 1.0
 
-def test_host_backend_fallback_raise(monkeypatch):
+def test_host_backend_fallback_raise():
     set_fallback_mode("raise")
-    hb = HostBackend()
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: (_ for _ in ()).throw(requests.RequestException()))
+    hb = HostBackend(session=DummySession(requests.RequestException()))
     with pytest.raises(MissingRateError):
         hb.get_rate("EUR", "USD")
+
+def test_host_backend_caches_responses(monkeypatch):
+    session = DummySession(1.5)
+    hb = HostBackend(session=session, latest_ttl=60)
+    for _ in range(3):
+        hb.get_rate("EUR", "USD", date(2020, 1, 2))
+        hb.get_rate("EUR", "USD")
+    assert len(session.calls) == 2
+    # expired "latest" responses are fetched again, historical ones are kept
+    import fxmoney.rates.host as host
+    monkeypatch.setattr(host.time, "monotonic", lambda: 1e12)
+    hb.get_rate("EUR", "USD", date(2020, 1, 2))
+    hb.get_rate("EUR", "USD")
+    assert len(session.calls) == 3
+
+def test_host_backend_coalesces_concurrent_requests():
+    import threading
+    release = threading.Event()
+
+    class SlowSession(DummySession):
+        def get(self, url, params, timeout):
+            release.wait(5)
+            return super().get(url, params, timeout)
+
+    session = SlowSession(1.5)
+    hb = HostBackend(session=session)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(hb.get_rate("EUR", "USD", date(2020, 1, 2))))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    release.set()
+    for t in threads:
+        t.join()
+    assert results == [1.5] * 8
+    assert len(session.calls) == 1
+
+# --- ECB date index & fallback ---------------------------------------------
+
+def _ecb_with(rates):
+    """ECBBackend over an in-memory rate table (no download, no CSV)."""
+    backend = ECBBackend.__new__(ECBBackend)
+    backend._set_rates(RateTable.from_rows(rates.items()))
+    backend._expires_at = float("inf")
+    return backend
+
+def test_ecb_lookup_uses_last_business_day():
+    backend = _ecb_with({
+        date(2020, 1, 2): {"USD": "1.10"},
+        date(2020, 1, 3): {"USD": "1.20"},
+        date(2020, 1, 6): {"USD": "1.30"},
+    })
+    assert backend.get_rate("EUR", "USD", date(2020, 1, 5)) == 1.2
+    assert backend.get_rate("EUR", "USD") == 1.3
+    assert backend.get_rate("EUR", "USD", date(2020, 1, 2)) == 1.1
+
+def test_ecb_missing_currency_falls_back_to_common_day():
+    backend = _ecb_with({
+        date(2020, 1, 2): {"USD": "1.00", "JPY": "100"},
+        date(2020, 1, 3): {"USD": "2.00"},
+        date(2020, 1, 6): {"JPY": "300"},
+    })
+    # neither 01-06 nor 01-03 quote both currencies → 01-02
+    assert backend.get_rate("USD", "JPY", date(2020, 1, 6)) == 100.0
+    set_fallback_mode("raise")
+    with pytest.raises(MissingRateError):
+        backend.get_rate("USD", "JPY", date(2020, 1, 6))
+
+def test_ecb_unknown_currency_raises_missing_rate():
+    backend = _ecb_with({date(2020, 1, 2): {"USD": "1.10"}})
+    with pytest.raises(MissingRateError):
+        backend.get_rate("EUR", "XXX")
+
+def test_ecb_cross_rate_matrix_matches_direct_path(monkeypatch):
+    from fxmoney.config import settings
+    backend = _ecb_with({
+        date(2020, 1, 2): {"USD": "1.1", "JPY": "121.5", "GBP": "0.85"},
+        date(2020, 1, 3): {"USD": "1.2", "JPY": "122"},
+    })
+    pairs = [("USD", "JPY"), ("GBP", "USD"), ("JPY", "GBP"), ("USD", "USD")]
+    days = [date(2020, 1, 2), date(2020, 1, 3), None]
+    for base in ("EUR", "USD"):
+        monkeypatch.setattr(settings, "base_currency", base)
+        monkeypatch.setattr(settings, "cross_rate_rows", 0)
+        direct = [backend.get_rate(s, t, d) for s, t in pairs for d in days]
+        monkeypatch.setattr(settings, "cross_rate_rows", 1)
+        assert [backend.get_rate(s, t, d) for s, t in pairs for d in days] == direct
+        assert backend._cross.base == base and len(backend._cross._rows) == 1
+    backend.precompute_cross_rates(5)
+    assert len(backend._cross._rows) == 1
+
+def test_ecb_decimal_rate_is_exact(monkeypatch):
+    backend = _ecb_with({date(2020, 1, 2): {"USD": "1.1194", "JPY": "121.48"}})
+    rate = backend.get_rate_decimal("USD", "JPY")
+    assert rate == Decimal(1) / Decimal("1.1194") * Decimal("121.48")
+    assert backend.get_rate("USD", "JPY") == float(rate)
+    assert backend.get_rate_decimal("USD", "USD") == 1
+
+def test_ecb_series_matches_daily_lookups():
+    from fxmoney.rates import get_series
+    backend = _ecb_with({
+        date(2020, 1, 2): {"USD": "1.00", "JPY": "100"},
+        date(2020, 1, 3): {"USD": "2.00"},
+        date(2020, 1, 6): {"USD": "3.00", "JPY": "330"},
+    })
+    start, end = date(2020, 1, 1), date(2020, 1, 7)
+    series = backend.get_series("USD", "JPY", start, end)
+    expected = [
+        (date(2020, 1, d), backend.get_rate_decimal("USD", "JPY", date(2020, 1, d)))
+        for d in range(1, 8)
+    ]
+    assert series == expected and series[2][1] == 100 and series[-1][1] == 110
+    # fill=None: only days quoting both currencies
+    assert backend.get_series("USD", "JPY", start, end, fill=None) == [expected[1], expected[5]]
+    assert get_series("EUR", "USD", start, end, fill=None, backend=backend) == [
+        (date(2020, 1, 2), 1), (date(2020, 1, 3), 2), (date(2020, 1, 6), 3)
+    ]
+    with pytest.raises(ValueError):
+        backend.get_series("USD", "JPY", start, end, fill="bfill")
+
+def test_ecb_series_before_history_follows_fallback_mode():
+    backend = _ecb_with({date(2020, 1, 2): {"USD": "1.10"}, date(2020, 1, 3): {"USD": "1.20"}})
+    start, end = date(2019, 12, 30), date(2020, 1, 3)
+    series = backend.get_series("EUR", "USD", start, end)
+    assert series == [
+        (date(2019, 12, d), backend.get_rate_decimal("EUR", "USD", date(2019, 12, d)))
+        for d in (30, 31)
+    ] + [(date(2020, 1, d), backend.get_rate_decimal("EUR", "USD", date(2020, 1, d))) for d in (1, 2, 3)]
+    assert series[0][1] == Decimal("1.10")
+    set_fallback_mode("raise")
+    assert [d for d, _ in backend.get_series("EUR", "USD", start, end)] == [
+        date(2020, 1, 2), date(2020, 1, 3)
+    ]
+
+def test_ecb_table_for_one_day():
+    backend = _ecb_with({
+        date(2020, 1, 2): {"USD": "1.00", "JPY": "100"},
+        date(2020, 1, 3): {"USD": "2.00"},
+    })
+    assert backend.get_table(date(2020, 1, 4)) == {"USD": 2, "JPY": 100}
+    assert backend.get_table(date(2020, 1, 3), ["usd", "EUR", "XXX"]) == {"USD": 2, "EUR": 1}
+    set_fallback_mode("raise")
+    assert backend.get_table(date(2020, 1, 3)) == {"USD": 2}
+
+def test_ecb_series_and_table_refresh_stale_cache_and_same_currency():
+    backend = _ecb_with({date(2020, 1, 2): {"USD": "1.00"}, date(2020, 1, 3): {"USD": "2.00"}})
+    refreshes = []
+    backend._start_refresh = lambda: refreshes.append(1)
+    backend._expires_at = 0.0
+    backend.get_table(date(2020, 1, 3))
+    backend.get_series("EUR", "USD", date(2020, 1, 2), date(2020, 1, 3))
+    assert len(refreshes) == 2
+    # a currency to itself is 1, like get_rate_decimal(), even if not in the table
+    assert backend.get_rate_decimal("XXX", "XXX", date(2020, 1, 3)) == 1
+    assert backend.get_series("XXX", "XXX", date(2020, 1, 2), date(2020, 1, 3), fill=None) == [
+        (date(2020, 1, 2), 1), (date(2020, 1, 3), 1)
+    ]
+
+def test_series_and_table_fall_back_to_single_lookups():
+    from fxmoney.rates import get_series, get_table
+    class Plain:
+        def get_rate(self, src, tgt, on_date=None):
+            if tgt == "XXX" or on_date == date(2020, 1, 2):
+                raise MissingRateError("no rate")
+            return 1.5 if on_date is None else float(on_date.day)
+    days = get_series("eur", "usd", date(2020, 1, 1), date(2020, 1, 3), backend=Plain())
+    assert days == [
+        (date(2020, 1, 1), 1), (date(2020, 1, 2), 1), (date(2020, 1, 3), 3)
+    ]
+    assert get_series("EUR", "USD", date(2020, 1, 1), date(2020, 1, 3), fill=None,
+                      backend=Plain()) == [(date(2020, 1, 1), 1), (date(2020, 1, 3), 3)]
+    assert get_table(None, ["USD", "XXX"], backend=Plain()) == {"USD": Decimal("1.5")}
+    with pytest.raises(ValueError):
+        get_table(backend=Plain())
+
+def test_convert_amount_prefers_decimal_rates(monkeypatch):
+    class Exact:
+        def get_rate(self, src, tgt, on_date=None):
+            raise AssertionError("float path used")
+        def get_rate_decimal(self, src, tgt, on_date=None):
+            return Decimal("1.2345678")
+    monkeypatch.setattr("fxmoney.rates._current_backend", Exact())
+    assert convert_amount(Decimal(2), "EUR", "USD") == Decimal("2.4691356")
+
+def test_default_backend_is_created_lazily(ecb_cache, monkeypatch):
+    import fxmoney.rates as rates
+    monkeypatch.setattr(rates, "_current_backend", None)
+    assert convert_amount(2, "EUR", "USD") == Decimal("2.2388")
+    assert isinstance(rates._current_backend, ECBBackend)
+
+# --- batch conversion ------------------------------------------------------
+
+class CountingBackend:
+    def __init__(self):
+        self.calls = []
+    def get_rate(self, src, tgt, on_date=None):
+        self.calls.append((src, tgt, on_date))
+        if src == "XXX":
+            raise MissingRateError("no XXX")
+        return {"USD": 2.0, "GBP": 0.5}.get(src, 1.0)
+
+def test_convert_many_resolves_each_rate_once(monkeypatch):
+    import fxmoney.rates as rates
+    backend = CountingBackend()
+    monkeypatch.setattr(rates, "_current_backend", backend)
+    d = date(2020, 1, 2)
+    out = rates.convert_many(
+        [1, "2.5", Decimal("3"), 4, 5],
+        ["USD", "USD", "GBP", "usd", "EUR"],
+        "EUR",
+        [d, d, d, d, None],
+    )
+    assert out == [Decimal("2.0"), Decimal("5.00"), Decimal("1.5"), Decimal("8.0"), Decimal("5")]
+    assert sorted(backend.calls, key=str) == [("GBP", "EUR", d), ("USD", "EUR", d)]
+    assert rates.convert_many([1], "XXX", "EUR") == [Decimal("1")]
+    with pytest.raises(MissingRateError):
+        rates.convert_many([1], "XXX", "EUR", fallback="raise")
+
+def test_convert_many_numpy(monkeypatch):
+    np = pytest.importorskip("numpy")
+    import fxmoney.rates as rates
+    backend = CountingBackend()
+    monkeypatch.setattr(rates, "_current_backend", backend)
+    d = date(2020, 1, 2)
+    out = rates.convert_many(
+        np.array([1.0, 2.0, 3.0, 4.0]),
+        np.array(["USD", "GBP", "USD", "USD"]),
+        "EUR",
+        [d, d, d, date(2020, 1, 3)],
+    )
+    assert out.tolist() == [2.0, 1.0, 6.0, 8.0]
+    assert len(backend.calls) == 3
+
+# --- non-blocking ECB refresh ----------------------------------------------
+
+def test_ecb_stale_refresh_runs_in_background(ecb_cache, monkeypatch):
+    import threading
+    import time
+    from fxmoney.rates import ecb
+    from conftest import ECB_CSV, write_ecb_zip
+
+    backend = ECBBackend()
+    release = threading.Event()
+    new_csv = ECB_CSV.replace("2020-01-06,1.1194", "2020-01-07,1.2000,121.00,0.85,\n2020-01-06,1.1194")
+
+    def slow_download(self):
+        release.wait(5)
+        write_ecb_zip(ecb.CACHE_ZIP, new_csv)
+        with open(ecb.CACHE_CSV, "w") as f:
+            f.write(new_csv)
+
+    monkeypatch.setattr(ECBBackend, "_download_and_extract", slow_download)
+    monkeypatch.setattr(ECBBackend, "_is_cache_fresh", lambda self: False)
+    backend._expires_at = 0
+    # answered from the old table while the download is still running
+    assert backend.get_rate("EUR", "USD") == 1.1194
+    release.set()
+    deadline = time.time() + 5
+    while backend.get_rate("EUR", "USD") != 1.2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert backend.get_rate("EUR", "USD") == 1.2
+
+def test_ecb_failed_refresh_keeps_serving(ecb_cache, monkeypatch):
+    import time
+    backend = ECBBackend()
+
+    def broken(self):
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(ECBBackend, "_download_and_extract", broken)
+    monkeypatch.setattr(ECBBackend, "_is_cache_fresh", lambda self: False)
+    backend._expires_at = 0
+    assert backend.get_rate("EUR", "USD") == 1.1194
+    deadline = time.time() + 5
+    while backend._expires_at == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert backend._expires_at > time.time()
+    assert backend.get_rate("EUR", "USD") == 1.1194
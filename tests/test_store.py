@@ -0,0 +1,43 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from fxmoney.rates.ecb import ECBBackend
+from fxmoney.rates.exceptions import MissingRateError
+from fxmoney.rates.store import RateStore, SQLiteRateStore, StoreBackend
+
+
+def test_sqlite_store_roundtrip_and_ranges(tmp_path):
+    path = str(tmp_path / "rates.sqlite3")
+    store = SQLiteRateStore(path)
+    assert isinstance(store, RateStore)
+    written = store.put_tables("eur", [
+        (date(2020, 1, 2), {"USD": "1.1193", "JPY": Decimal("121.75")}),
+        (date(2020, 1, 3), {"USD": 1.1147}),
+    ])
+    assert written == 3
+    store.close()
+
+    # persisted across instances (and processes)
+    store = SQLiteRateStore(path)
+    assert store.get_table("EUR", date(2020, 1, 2)) == {"USD": Decimal("1.1193"), "JPY": Decimal("121.75")}
+    assert store.get_table("EUR", date(2020, 1, 4)) is None
+    assert store.table_on_or_before("EUR", date(2020, 1, 5)) == (date(2020, 1, 3), {"USD": Decimal("1.1147")})
+    assert store.table_on_or_before("EUR", date(2020, 1, 1)) is None
+    assert store.series("EUR", "usd", date(2020, 1, 1), date(2020, 1, 31)) == [
+        (date(2020, 1, 2), Decimal("1.1193")),
+        (date(2020, 1, 3), Decimal("1.1147")),
+    ]
+    store.close()
+
+
+def test_ecb_seeded_store_backend_matches_ecb(ecb_cache):
+    ecb = ECBBackend()
+    store = SQLiteRateStore(":memory:")
+    assert ecb.seed_store(store, start=date(2020, 1, 3)) == 5
+    backend = StoreBackend(store)
+    for day in (date(2020, 1, 3), date(2020, 1, 5), None):
+        assert backend.get_rate_decimal("USD", "JPY", day) == ecb.get_rate_decimal("USD", "JPY", day)
+    with pytest.raises(MissingRateError):
+        backend.get_rate("USD", "JPY", date(2020, 1, 2))